@@ -77,7 +77,7 @@ class TargetTag(Base):
         UniqueConstraint("target_id", "tag_id", "origin", name="ux_target_tags_target_tag_origin"),
         CheckConstraint("origin IN ('AUTO','DIRECT','GROUP')", name="ck_target_tags_origin"),
         Index("idx_target_tags_tag", "tag_id"),
-        Index("idx_target_tags_target", "target_id"),
+        Index("idx_target_tags_target_origin_group", "target_id", "origin", "source_group_id"),
     )
 
 
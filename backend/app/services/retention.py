@@ -6,11 +6,13 @@ Retention is evaluated per (job_id, target_id) pair.
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
 import shutil
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.orm import Session
@@ -27,9 +29,14 @@ logger = logging.getLogger(__name__)
 SERVER_TZ = ZoneInfo("Asia/Singapore")
 
 
+@lru_cache(maxsize=512)
 def _parse_retention_policy(policy_json: Optional[str]) -> Optional[Dict[str, Any]]:
     """Parse a retention policy JSON string into a dict.
     
+    Results are memoized per string, so a sweep over many targets of one job
+    parses its policy once. The cached dict is shared between callers: module
+    internals only read it, and public entry points hand out copies.
+    
     Returns None if policy_json is None/empty or invalid.
     """
     if not policy_json:
@@ -181,6 +188,7 @@ def compute_keep_set(
     candidates: List[TargetRunModel],
     policy: Dict[str, Any],
     now: Optional[datetime] = None,
+    presorted: bool = False,
 ) -> Set[int]:
     """Compute which TargetRun IDs to keep based on retention policy.
     
@@ -200,6 +208,8 @@ def compute_keep_set(
         candidates: List of TargetRun objects with artifact_path set
         policy: Parsed retention policy dict with 'rules' list
         now: Current time for window calculation (defaults to utcnow)
+        presorted: Candidates are already ordered by started_at, latest first,
+            so per-bucket sorting can be skipped
     
     Returns:
         Set of TargetRun IDs to keep
@@ -261,8 +271,9 @@ def compute_keep_set(
         
         # For each bucket, keep the N latest
         for bucket_key, bucket_trs in buckets.items():
-            # Sort by started_at descending (latest first)
-            bucket_trs.sort(key=lambda x: _ensure_tz_aware(x.started_at) if x.started_at else datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+            # Sort by started_at descending (latest first); buckets inherit presorted order
+            if not presorted:
+                bucket_trs.sort(key=lambda x: _ensure_tz_aware(x.started_at) if x.started_at else datetime.min.replace(tzinfo=timezone.utc), reverse=True)
             for tr in bucket_trs[:keep_per_bucket]:
                 keep_ids.add(tr.id)
                 processed_candidates.add(tr.id)
@@ -277,27 +288,32 @@ def _delete_artifact(artifact_path: str) -> bool:
     """
     success = True
     
-    # Delete main artifact
-    if os.path.exists(artifact_path):
+    # Delete main artifact; EAFP avoids an extra stat per path
+    try:
         try:
-            if os.path.isdir(artifact_path):
-                shutil.rmtree(artifact_path)
-            else:
-                os.remove(artifact_path)
-            logger.info("retention_artifact_deleted | path=%s", artifact_path)
-        except Exception as exc:
-            logger.error("retention_artifact_delete_failed | path=%s error=%s", artifact_path, exc)
-            success = False
+            os.remove(artifact_path)
+        except (IsADirectoryError, PermissionError):
+            # Linux raises EISDIR for directories; macOS/BSD raise EPERM
+            if not os.path.isdir(artifact_path):
+                raise
+            shutil.rmtree(artifact_path)
+        logger.info("retention_artifact_deleted | path=%s", artifact_path)
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.error("retention_artifact_delete_failed | path=%s error=%s", artifact_path, exc)
+        success = False
     
     # Delete sidecar metadata
     sidecar_path = f"{artifact_path}.meta.json"
-    if os.path.exists(sidecar_path):
-        try:
-            os.remove(sidecar_path)
-            logger.info("retention_sidecar_deleted | path=%s", sidecar_path)
-        except Exception as exc:
-            logger.error("retention_sidecar_delete_failed | path=%s error=%s", sidecar_path, exc)
-            success = False
+    try:
+        os.remove(sidecar_path)
+        logger.info("retention_sidecar_deleted | path=%s", sidecar_path)
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.error("retention_sidecar_delete_failed | path=%s error=%s", sidecar_path, exc)
+        success = False
     
     return success
 
@@ -307,6 +323,7 @@ def apply_retention(
     job_id: int,
     target_id: int,
     dry_run: bool = False,
+    now: Optional[datetime] = None,
 ) -> Dict[str, Any]:
     """Apply retention policy to backups for a specific (job_id, target_id) pair.
     
@@ -315,6 +332,7 @@ def apply_retention(
         job_id: Job ID to filter by
         target_id: Target ID to filter by
         dry_run: If True, compute but don't actually delete
+        now: Current time for window calculation (defaults to now in SERVER_TZ)
     
     Returns:
         Dict with counts and paths:
@@ -353,7 +371,7 @@ def apply_retention(
         return {"keep_count": 0, "delete_count": 0, "deleted_paths": [], "kept_paths": []}
     
     # Compute keep set
-    keep_ids = compute_keep_set(candidates, policy)
+    keep_ids = compute_keep_set(candidates, policy, now=now)
     
     # Partition into keep and delete
     to_keep = [tr for tr in candidates if tr.id in keep_ids]
@@ -467,8 +485,11 @@ class RetentionService:
         self.db = db
     
     def get_effective_policy(self, job_id: int) -> Optional[Dict[str, Any]]:
-        """Get the effective retention policy for a job."""
-        return _get_effective_policy(self.db, job_id)
+        """Get the effective retention policy for a job.
+        
+        Returns a copy, so callers may modify it without touching the cache.
+        """
+        return copy.deepcopy(_get_effective_policy(self.db, job_id))
     
     def apply_for_job_target(
         self,
@@ -0,0 +1,10 @@
+-- Migration: Add composite index for origin-scoped target_tags lookups
+-- Date: 2026-10-17
+-- Description: Target/group services filter target_tags by (target_id, origin, source_group_id)
+-- when propagating and removing GROUP-origin tags and resolving AUTO tags
+
+CREATE INDEX IF NOT EXISTS idx_target_tags_target_origin_group
+    ON target_tags(target_id, origin, source_group_id);
+
+-- The composite index leads with target_id, so the single-column one is redundant
+DROP INDEX IF EXISTS idx_target_tags_target;
@@ -2,28 +2,214 @@
 
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Callable, Generator
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+# Ensure models are registered with Base before any schema is created
+import app.models  # noqa: F401
 from app.core.db import Base
 
+# Single sessionmaker shared by every per-test engine; bind is supplied per call
+_TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+# (previous tempfile.tempdir, session tmpfs dir or None once kept) while the override is active
+_shm_tmpdir_key = pytest.StashKey[tuple]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Root this session's temp files in a private tmpfs directory when possible.
+
+    ``tmp_path`` files are throwaway, so keeping them in RAM skips disk
+    write-back. An explicit ``TMPDIR`` is respected; xdist workers inherit the
+    controller's directory that way and leave setup and cleanup to it.
+    """
+    shm = "/dev/shm"
+    if os.environ.get("TMPDIR") or not (os.path.isdir(shm) and os.access(shm, os.W_OK)):
+        return
+    session_dir = tempfile.mkdtemp(prefix="homelab-backup-tests-", dir=shm)
+    config.stash[_shm_tmpdir_key] = (tempfile.tempdir, session_dir)
+    os.environ["TMPDIR"] = session_dir
+    tempfile.tempdir = session_dir
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:  # noqa: ANN001
+    """Keep the session tmpfs directory, and say where it is, when the run failed."""
+    saved = config.stash.get(_shm_tmpdir_key, None)
+    if saved is None or exitstatus == pytest.ExitCode.OK:
+        return
+    previous_tempdir, session_dir = saved
+    config.stash[_shm_tmpdir_key] = (previous_tempdir, None)
+    terminalreporter.write_line(f"tmp_path contents kept for inspection under {session_dir}")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Restore the temp settings and drop the session tmpfs directory unless kept."""
+    saved = config.stash.get(_shm_tmpdir_key, None)
+    if saved is None:
+        return
+    previous_tempdir, session_dir = saved
+    del config.stash[_shm_tmpdir_key]
+    os.environ.pop("TMPDIR", None)
+    tempfile.tempdir = previous_tempdir
+    if session_dir is not None:
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def _fast_sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ANN001
+    """Trade durability for speed; test databases are disposable."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _sqlite_engine(path: Path) -> Engine:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(engine, "connect", _fast_sqlite_pragmas)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def sqlite_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create the full schema once into a template SQLite file.
+
+    Per-test databases are byte copies of this file, which is much cheaper
+    than replaying the DDL for every model on each test.
+    """
+    template = tmp_path_factory.mktemp("tmpl") / "template.db"
+    engine = _sqlite_engine(template)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return template
+
+
+@pytest.fixture()
+def fresh_engine(sqlite_template: Path, tmp_path: Path) -> Generator[Engine, None, None]:
+    """Provide an engine bound to a pristine copy of the template database."""
+    db_file = tmp_path / "test.db"
+    shutil.copyfile(sqlite_template, db_file)
+    engine = _sqlite_engine(db_file)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def artifact_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory for synthetic artifact paths returned by stub backup plugins.
+
+    Stubs only need a unique path string; nothing is written here.
+    """
+    return tmp_path_factory.mktemp("backups")
+
+
+@pytest.fixture()
+def fake_fs(request: pytest.FixtureRequest):
+    """In-memory filesystem for logic-only tests; skipped when pyfakefs is absent."""
+    pytest.importorskip("pyfakefs")
+    return request.getfixturevalue("fs")
+
+
+@pytest.fixture()
+def session_factory(fresh_engine: Engine) -> Callable[..., Session]:
+    """Session factory bound to this test's fresh engine."""
+    return partial(_TestingSessionLocal, bind=fresh_engine)
+
 
 @pytest.fixture()
-def db_session() -> Session:
+def db_session(session_factory: Callable[..., Session]) -> Session:
     """Provide a test DB session."""
+    yield session_factory()
+
+
+@pytest.fixture(scope="session")
+def _engine() -> Generator[Engine, None, None]:
+    """Shared in-memory engine with the schema created once per test session."""
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    # Ensure models are imported
-    import app.models  # noqa: F401
+    event.listen(engine, "connect", _fast_sqlite_pragmas)
+
+    # pysqlite defers BEGIN and breaks SAVEPOINT semantics; let SQLAlchemy drive it
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record) -> None:  # noqa: ANN001
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn) -> None:  # noqa: ANN001
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     try:
-        yield TestingSessionLocal()
+        yield engine
     finally:
-        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
 
+@pytest.fixture()
+def session(_engine: Engine) -> Generator[Session, None, None]:
+    """Session whose commits land in a SAVEPOINT that is rolled back after the test.
+
+    Commits do not expire loaded objects, so reading a just-created row's
+    attributes does not cost another SELECT.
+    """
+    conn = _engine.connect()
+    trans = conn.begin()
+    db = Session(
+        bind=conn,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield db
+    finally:
+        db.close()
+        trans.rollback()
+        conn.close()
+
+
+@pytest.fixture(scope="session")
+def _memory_scheduler():
+    """Unstarted, memory-backed scheduler built once per test session.
+
+    Jobs added before ``start()`` stay pending in memory, so no event loop,
+    thread or timer is created. APScheduler is imported lazily to keep it off
+    the import path of tests that do not need it.
+    """
+    from apscheduler.jobstores.memory import MemoryJobStore
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    return AsyncIOScheduler(
+        jobstores={"default": MemoryJobStore()},
+        timezone="Asia/Singapore",
+    )
+
+
+@pytest.fixture()
+def fake_scheduler(_memory_scheduler, monkeypatch: pytest.MonkeyPatch):
+    """Install the shared memory scheduler as the global one, emptied after each test."""
+    monkeypatch.setattr("app.core.scheduler._scheduler", _memory_scheduler)
+    try:
+        yield _memory_scheduler
+    finally:
+        _memory_scheduler.remove_all_jobs()
@@ -0,0 +1,53 @@
+"""Bulk builders and lookups for model graphs that tests need but do not exercise."""
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Group, GroupTag, Tag, Target, TargetTag
+
+
+def make_target_with_groups(
+    db: Session,
+    name: str,
+    group_tag_specs: Mapping[str, Sequence[str]],
+    direct_tags: Sequence[str] = (),
+) -> tuple[Target, dict[str, Group]]:
+    """Build a target plus groups (each linked to its tags) with a single flush.
+
+    ``group_tag_specs`` maps group name to tag display names. The target is not
+    placed in any group; ``direct_tags`` are attached to it with DIRECT origin.
+    """
+    tags: dict[str, Tag] = {}
+
+    def _tag(display_name: str) -> Tag:
+        if display_name not in tags:
+            tags[display_name] = Tag(display_name=display_name)
+        return tags[display_name]
+
+    groups = {
+        group_name: Group(
+            name=group_name,
+            group_tags=[GroupTag(tag=_tag(t)) for t in tag_names],
+        )
+        for group_name, tag_names in group_tag_specs.items()
+    }
+    target = Target(
+        name=name,
+        plugin_name="p",
+        plugin_config_json="{}",
+        target_tags=[TargetTag(tag=_tag(t), origin="DIRECT") for t in direct_tags],
+    )
+    db.add_all([*groups.values(), target])
+    db.flush()
+    return target, groups
+
+
+def auto_tag_of(db: Session, target_id: int) -> TargetTag:
+    """Return the target's single AUTO-origin ``TargetTag`` row."""
+    return db.execute(
+        select(TargetTag).where(TargetTag.target_id == target_id, TargetTag.origin == "AUTO")
+    ).scalar_one()
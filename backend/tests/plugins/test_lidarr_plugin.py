@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from typing import Any
 
 import httpx
@@ -57,4 +58,5 @@ async def test_lidarr_backup_writes_artifact(monkeypatch, tmp_path):
     result = await plugin.backup(ctx)
     artifact_path = result.get("artifact_path")
     assert artifact_path and os.path.exists(artifact_path)
+    assert Path(artifact_path).is_relative_to(tmp_path)
     assert artifact_path.endswith(".zip")
@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-from typing import Generator
+from typing import Callable, Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 
 from app.main import app
-from app.core.db import Base, get_session
+from app.core.db import get_session
 
 
 class _DummyScheduler:
@@ -23,29 +21,23 @@ class _DummyScheduler:
 
 
 @pytest.fixture
-def db_session_override() -> Generator[Session, None, None]:
+def db_session_override(
+    session_factory: Callable[..., Session],
+) -> Generator[Session, None, None]:
     """Provide a test DB session and override FastAPI dependency."""
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    # Ensure models are registered with Base before creating tables
-    import app.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
-
-    db = TestingSessionLocal()
+    db = session_factory()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
 
 
 @pytest.fixture
-def client(db_session_override: Session, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+def client(
+    db_session_override: Session,
+    fake_scheduler: object,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[TestClient, None, None]:
     """FastAPI TestClient with DB and scheduler overrides."""
 
     def override_get_session() -> Generator[Session, None, None]:
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import tempfile
 import time
+from pathlib import Path
 from typing import Any, Dict
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
@@ -32,7 +33,9 @@ def wait_for_run_completion(
     raise AssertionError(f"Run {run_id} did not complete. Last payload={last_payload}")
 
 
-def test_jobs_crud_and_run_now(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_jobs_crud_and_run_now(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, artifact_dir: Path
+) -> None:
     # Provide a minimal success plugin so the run-now path can complete
     class _SuccessPlugin(BackupPlugin):
         async def validate_config(self, config: Dict[str, Any]) -> bool:  # noqa: ARG002
@@ -40,7 +43,7 @@ def test_jobs_crud_and_run_now(client: TestClient, monkeypatch: pytest.MonkeyPat
         async def test(self, config: Dict[str, Any]) -> bool:  # noqa: ARG002
             return True
         async def backup(self, context: BackupContext) -> Dict[str, Any]:  # noqa: ARG002
-            fd, path = tempfile.mkstemp(prefix="backup-test-", suffix=".txt")
+            path = str(artifact_dir / f"backup-{uuid4().hex}.txt")
             return {"artifact_path": path}
         async def restore(self, context: RestoreContext) -> Dict[str, Any]:  # noqa: ARG002
             return {"ok": True}
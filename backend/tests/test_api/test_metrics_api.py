@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import tempfile
 import time
+from pathlib import Path
 from typing import Any, Dict
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
@@ -75,7 +76,9 @@ class TestMetricsEndpoint:
         metric_lines = [l for l in lines if l.startswith("job_") or l.startswith("last_run_")]
         assert len(metric_lines) == 0
 
-    def test_metrics_endpoint_with_job_runs(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    def test_metrics_endpoint_with_job_runs(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch, artifact_dir: Path
+    ):
         """Test metrics endpoint with actual job runs."""
         # Create a success plugin for testing
         class _SuccessPlugin(BackupPlugin):
@@ -84,7 +87,7 @@ class TestMetricsEndpoint:
             async def test(self, config: Dict[str, Any]) -> bool:
                 return True
             async def backup(self, context: BackupContext) -> Dict[str, Any]:
-                fd, path = tempfile.mkstemp(prefix="backup-test-", suffix=".txt")
+                path = str(artifact_dir / f"backup-{uuid4().hex}.txt")
                 return {"artifact_path": path}
             async def restore(self, context: RestoreContext) -> Dict[str, Any]:
                 return {"ok": True}
@@ -208,7 +211,9 @@ class TestMetricsEndpoint:
         assert 'job_failure_total{job_id="1",job_name="Failed Job"} 1' in content
         assert 'last_run_timestamp{job_id="1",job_name="Failed Job"}' in content
 
-    def test_metrics_endpoint_with_special_characters(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    def test_metrics_endpoint_with_special_characters(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch, artifact_dir: Path
+    ):
         """Test metrics endpoint with special characters in job names."""
         # Create a success plugin for testing
         class _SuccessPlugin(BackupPlugin):
@@ -217,7 +222,7 @@ class TestMetricsEndpoint:
             async def test(self, config: Dict[str, Any]) -> bool:
                 return True
             async def backup(self, context: BackupContext) -> Dict[str, Any]:
-                fd, path = tempfile.mkstemp(prefix="backup-test-", suffix=".txt")
+                path = str(artifact_dir / f"backup-{uuid4().hex}.txt")
                 return {"artifact_path": path}
             async def restore(self, context: RestoreContext) -> Dict[str, Any]:
                 return {"ok": True}
@@ -36,10 +36,10 @@ def _get_tag_id_for_target(client: TestClient, target_name: str) -> int:
 
 
 def _create_job(db: Session, tag_id: int, name: str) -> JobModel:
+    # Flush only: the job is committed together with the run rows that follow
     job = JobModel(tag_id=tag_id, name=name, schedule_cron="0 2 * * *", enabled=True)
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    db.flush()
     return job
 
 
@@ -62,8 +62,7 @@ def _create_source_target_run(
         started_at=datetime.now(timezone.utc),
     )
     db.add(run)
-    db.commit()
-    db.refresh(run)
+    db.flush()
 
     target_run = TargetRunModel(
         run_id=run.id,
@@ -79,7 +78,6 @@ def _create_source_target_run(
     )
     db.add(target_run)
     db.commit()
-    db.refresh(target_run)
     return target_run
 
 
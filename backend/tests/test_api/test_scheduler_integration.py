@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import pytest
 from sqlalchemy.orm import Session
 
 from app.models import Run as RunModel
 from app.core.scheduler import scheduled_tick_with_session
 
 
+pytestmark = pytest.mark.scheduler
+
+
 def test_scheduler_tick_runs_jobs_by_tag_and_skips_overlap(client, db_session_override: Session) -> None:
     # Create two targets
     r = client.post(
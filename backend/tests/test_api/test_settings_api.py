@@ -7,35 +7,22 @@ import json
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session
 
-from app.core.db import Base, get_session
+from app.core.db import get_session
 from app.api import settings as settings_router
 from app.models import Settings as SettingsModel
 from app.domain.enums import RunStatus
 
 
 @pytest.fixture()
-def app_with_db():
-    """Create a test app with in-memory database."""
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    # Import all models to register them
-    import app.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
-    
+def app_with_db(session_factory):
+    """Create a test app with a fresh database."""
     app = FastAPI()
     app.include_router(settings_router.router)
     
     def override_get_session():
-        db = TestingSessionLocal()
+        db = session_factory()
         try:
             yield db
         finally:
@@ -43,9 +30,7 @@ def app_with_db():
     
     app.dependency_overrides[get_session] = override_get_session
     
-    yield app, TestingSessionLocal
-    
-    Base.metadata.drop_all(bind=engine)
+    yield app, session_factory
 
 
 class TestGetSettings:
@@ -179,7 +164,6 @@ class TestRetentionRun:
         db.add(manual_job)
         db.commit()
         job_id = manual_job.id
-        db.close()
         
         client = TestClient(app)
         response = client.post("/settings/retention/run")
@@ -187,8 +171,8 @@ class TestRetentionRun:
         # Should succeed (even if no backups to clean)
         assert response.status_code in [200, 500]  # 500 if no backups exist, 200 if successful
         
-        # Check that MaintenanceRun was created
-        db = SessionLocal()
+        # Check that MaintenanceRun was created; expire to observe the API's commits
+        db.expire_all()
         runs = db.query(MaintenanceRunModel).filter(
             MaintenanceRunModel.maintenance_job_id == job_id
         ).all()
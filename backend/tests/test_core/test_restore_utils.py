@@ -8,10 +8,12 @@ import pytest
 from app.core.plugins.base import RestoreContext
 from app.core.plugins.restore_utils import copy_artifact_for_restore
 
+_LOG = logging.getLogger("test_restore_utils")
 
-def test_copy_artifact_for_restore(tmp_path: Path) -> None:
-    artifact = tmp_path / "artifact.sql"
-    artifact.write_text("restore data")
+
+def test_copy_artifact_for_restore(fake_fs) -> None:
+    artifact = Path("/src/artifact.sql")
+    fake_fs.create_file(artifact, contents="restore data")
 
     ctx = RestoreContext(
         job_id="99",
@@ -24,8 +26,8 @@ def test_copy_artifact_for_restore(tmp_path: Path) -> None:
 
     result = copy_artifact_for_restore(
         ctx,
-        logger=logging.getLogger("test"),
-        restore_root=str(tmp_path),
+        logger=_LOG,
+        restore_root="/restore",
         prefix="unit",
     )
 
@@ -51,7 +53,7 @@ def test_copy_artifact_for_restore_missing(tmp_path: Path) -> None:
     with pytest.raises(FileNotFoundError):
         copy_artifact_for_restore(
             ctx,
-            logger=logging.getLogger("test"),
+            logger=_LOG,
             restore_root=str(tmp_path),
             prefix="unit",
         )
@@ -0,0 +1,68 @@
+"""Tests for scheduler job (re)registration helpers."""
+
+from __future__ import annotations
+
+import pytest
+from apscheduler.triggers.cron import CronTrigger
+
+from app.core.scheduler import remove_job, reschedule_job, scheduled_tick
+
+pytestmark = pytest.mark.scheduler
+
+_CRONS = ("0 2 * * *", "30 4 * * *")
+
+
+@pytest.fixture(scope="module")
+def triggers() -> dict[str, CronTrigger]:
+    """Cron triggers parsed once for the module, keyed by expression."""
+    return {cron: CronTrigger.from_crontab(cron) for cron in _CRONS}
+
+
+@pytest.fixture(autouse=True)
+def _parsed_crons(monkeypatch: pytest.MonkeyPatch, triggers) -> None:
+    """Serve known expressions from ``triggers``; anything else is parsed as usual."""
+    parse = CronTrigger.from_crontab
+
+    def from_crontab(expr: str, timezone=None) -> CronTrigger:  # noqa: ANN001
+        if timezone is None and expr in triggers:
+            return triggers[expr]
+        return parse(expr, timezone)
+
+    monkeypatch.setattr(CronTrigger, "from_crontab", from_crontab)
+
+
+def test_reschedule_job_updates_scheduler(fake_scheduler, triggers) -> None:
+    cron = "0 2 * * *"
+    assert reschedule_job(7, cron, enabled=True) is True
+
+    job = fake_scheduler.get_job("job:7")
+    assert job is not None
+    assert job.func is scheduled_tick
+    assert job.kwargs == {"job_id": 7}
+
+    cron = "30 4 * * *"
+    assert reschedule_job(7, cron, enabled=True) is True
+    job = fake_scheduler.get_job("job:7")
+    assert job.trigger is triggers[cron]
+    fields = {f.name: str(f) for f in job.trigger.fields}
+    assert (fields["hour"], fields["minute"]) == ("4", "30")
+    assert len(fake_scheduler.get_jobs()) == 1
+
+
+def test_reschedule_job_disabled_removes_existing(fake_scheduler) -> None:
+    reschedule_job(8, "0 2 * * *", enabled=True)
+
+    assert reschedule_job(8, "0 2 * * *", enabled=False) is True
+    assert fake_scheduler.get_job("job:8") is None
+
+
+def test_reschedule_job_invalid_cron_returns_false(fake_scheduler) -> None:
+    assert reschedule_job(9, "BAD CRON", enabled=True) is False
+    assert fake_scheduler.get_job("job:9") is None
+
+
+def test_remove_job(fake_scheduler) -> None:
+    reschedule_job(10, "0 2 * * *", enabled=True)
+
+    assert remove_job(10) is True
+    assert fake_scheduler.get_job("job:10") is None
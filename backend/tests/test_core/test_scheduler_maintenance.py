@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import json
+from typing import Generator
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, patch
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import MaintenanceJob as MaintenanceJobModel, MaintenanceRun as MaintenanceRunModel
@@ -17,87 +22,103 @@ from app.core.scheduler import (
     scheduled_tick,  # For backup job execution
 )
 
+pytestmark = pytest.mark.scheduler
+
+_RC = MaintenanceJobType.RETENTION_CLEANUP.value
+_OK = RunStatus.SUCCESS.value
+_FAILED = RunStatus.FAILED.value
+
 
-def test_scheduled_item_from_backup_job(db_session: Session):
-    """Test ScheduledItem adapter for backup jobs."""
+@pytest.fixture()
+def tag(db_session: Session):
+    """Flush a tag that backup jobs can reference; callers own the commit."""
     from app.models import Tag as TagModel
-    
+
     tag = TagModel(display_name="test-tag")
     db_session.add(tag)
-    db_session.commit()
-    db_session.refresh(tag)
-    
-    job = JobModel(
-        tag_id=tag.id,
-        name="Test Backup Job",
-        schedule_cron="0 2 * * *",
-        enabled=True,
-    )
-    db_session.add(job)
-    db_session.commit()
-    db_session.refresh(job)
-    
-    item = ScheduledItem.from_backup_job(job)
-    assert item.kind == "backup"
-    assert item.id == job.id
-    assert item.name == "Test Backup Job"
-    assert item.schedule_cron == "0 2 * * *"
-    assert item.enabled is True
+    db_session.flush()
+    return tag
 
 
-def test_scheduled_item_from_maintenance_job(db_session: Session):
-    """Test ScheduledItem adapter for maintenance jobs."""
-    job = MaintenanceJobModel(
-        key="test_maintenance",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
-        name="Test Maintenance Job",
-        schedule_cron="0 3 * * *",
-        enabled=True,
-    )
+@pytest.fixture()
+def fake_get_session(monkeypatch: pytest.MonkeyPatch, db_session: Session):
+    """Patch ``get_session`` with a generator yielding the test session.
+
+    Mirrors the production dependency shape (a generator consumed via
+    ``next(get_session())``) rather than a bare iterator.
+    """
+
+    def gen() -> Generator[Session, None, None]:
+        yield db_session
+
+    monkeypatch.setattr("app.core.db.get_session", gen)
+    return gen
+
+
+@pytest.fixture(params=["backup", "maintenance"])
+def scheduled_item_case(request: pytest.FixtureRequest, db_session: Session):
+    """Build a persisted job of each kind and adapt it to a ScheduledItem.
+
+    Returns ``(kind, item, job)`` so the adapter contract can be asserted once.
+    """
+    kind = request.param
+    if kind == "backup":
+        tag = request.getfixturevalue("tag")
+        job = JobModel(
+            tag_id=tag.id,
+            name="Test Backup Job",
+            schedule_cron="0 2 * * *",
+            enabled=True,
+        )
+        factory = ScheduledItem.from_backup_job
+    else:
+        job = MaintenanceJobModel(
+            key="test_maintenance",
+            job_type=_RC,
+            name="Test Maintenance Job",
+            schedule_cron="0 3 * * *",
+            enabled=True,
+        )
+        factory = ScheduledItem.from_maintenance_job
     db_session.add(job)
     db_session.commit()
     db_session.refresh(job)
-    
-    item = ScheduledItem.from_maintenance_job(job)
-    assert item.kind == "maintenance"
+    return kind, factory(job), job
+
+
+def test_scheduled_item_adapters(scheduled_item_case):
+    """Test ScheduledItem adapters for backup and maintenance jobs."""
+    kind, item, job = scheduled_item_case
+    assert item.kind == kind
     assert item.id == job.id
-    assert item.name == "Test Maintenance Job"
-    assert item.schedule_cron == "0 3 * * *"
+    assert item.name == job.name
+    assert item.schedule_cron == job.schedule_cron
     assert item.enabled is True
 
 
-def test_schedule_jobs_on_startup_loads_both_types(db_session: Session):
+def test_schedule_jobs_on_startup_loads_both_types(db_session: Session, tag):
     """Test that schedule_jobs_on_startup loads both backup and maintenance jobs."""
-    from app.models import Tag as TagModel
-    
     # Create backup job
-    tag = TagModel(display_name="test-tag")
-    db_session.add(tag)
-    db_session.commit()
-    db_session.refresh(tag)
-    
     backup_job = JobModel(
         tag_id=tag.id,
         name="Backup Job",
         schedule_cron="0 2 * * *",
         enabled=True,
     )
-    db_session.add(backup_job)
     
     # Create maintenance job
     maint_job = MaintenanceJobModel(
         key="test_maintenance",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Maintenance Job",
         schedule_cron="0 3 * * *",
         enabled=True,
     )
-    db_session.add(maint_job)
+    db_session.add_all([backup_job, maint_job])
     db_session.commit()
     
     # Mock scheduler
-    mock_scheduler = Mock()
-    mock_scheduler.add_job = Mock()
+    mock_scheduler = MagicMock(spec=AsyncIOScheduler)
     
     schedule_jobs_on_startup(mock_scheduler, db_session)
     
@@ -117,11 +138,37 @@ def test_schedule_jobs_on_startup_loads_both_types(db_session: Session):
         assert "job_id" in call.kwargs["kwargs"]
 
 
+def test_schedule_jobs_on_startup_filters_and_args(db_session: Session, tag):
+    """Disabled jobs and invalid crons are skipped; enabled jobs get dispatch args."""
+    # Core bulk insert: one statement, and it bypasses the ORM cron validator so
+    # an invalid expression can be seeded to exercise the scheduler's guard.
+    enabled_valid, _disabled, _bad_cron = db_session.scalars(
+        insert(JobModel).returning(JobModel.id, sort_by_parameter_order=True),
+        [
+            {"tag_id": tag.id, "name": "Enabled", "schedule_cron": "0 2 * * *", "enabled": True},
+            {"tag_id": tag.id, "name": "Disabled", "schedule_cron": "0 2 * * *", "enabled": False},
+            {"tag_id": tag.id, "name": "Bad", "schedule_cron": "BAD CRON", "enabled": True},
+        ],
+    ).all()
+    db_session.commit()
+
+    mock_scheduler = MagicMock(spec=AsyncIOScheduler)
+
+    schedule_jobs_on_startup(mock_scheduler, db_session)
+
+    mock_scheduler.add_job.assert_called_once()
+    kwargs = mock_scheduler.add_job.call_args.kwargs
+    assert kwargs["id"] == f"backup:{enabled_valid}"
+    assert kwargs["name"] == "Enabled"
+    assert kwargs["func"] == scheduled_dispatch
+    assert kwargs["kwargs"] == {"kind": "backup", "job_id": enabled_valid}
+
+
 def test_scheduled_dispatch_routes_to_maintenance(db_session: Session):
     """Test that scheduled_dispatch routes maintenance jobs correctly."""
     job = MaintenanceJobModel(
         key="test_maintenance",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Maintenance",
         schedule_cron="0 3 * * *",
         enabled=True,
@@ -136,11 +183,11 @@ def test_scheduled_dispatch_routes_to_maintenance(db_session: Session):
         mock_exec.assert_called_once_with(job.id)
 
 
-def test_execute_maintenance_job_creates_run(db_session: Session):
+def test_execute_maintenance_job_creates_run(db_session: Session, fake_get_session):
     """Test that execute_maintenance_job creates a MaintenanceRun."""
     job = MaintenanceJobModel(
         key="test_maintenance",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Maintenance",
         schedule_cron="0 3 * * *",
         enabled=True,
@@ -158,34 +205,27 @@ def test_execute_maintenance_job_creates_run(db_session: Session):
             "deleted_paths": [],
         }
         
-        # Mock get_session to return our test db_session
-        with patch("app.core.db.get_session") as mock_get_session:
-            mock_get_session.return_value = iter([db_session])
-            job_id = job.id
-            execute_maintenance_job(job_id)
+        job_id = job.id
+        execute_maintenance_job(job_id)
         
         # Check that MaintenanceRun was created
-        runs = db_session.query(MaintenanceRunModel).filter(
+        run = db_session.query(MaintenanceRunModel).filter(
             MaintenanceRunModel.maintenance_job_id == job_id
-        ).all()
-        assert len(runs) == 1
-        
-        run = runs[0]
-        assert run.status == RunStatus.SUCCESS.value
+        ).one()
+        assert run.status == _OK
         assert run.finished_at is not None
         assert run.result_json is not None
         
-        import json
         result = json.loads(run.result_json)
         assert result["targets_processed"] == 5
         assert result["deleted_count"] == 2
 
 
-def test_execute_maintenance_job_handles_failure(db_session: Session):
+def test_execute_maintenance_job_handles_failure(db_session: Session, fake_get_session):
     """Test that execute_maintenance_job handles failures correctly."""
     job = MaintenanceJobModel(
         key="test_maintenance",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Maintenance",
         schedule_cron="0 3 * * *",
         enabled=True,
@@ -199,22 +239,15 @@ def test_execute_maintenance_job_handles_failure(db_session: Session):
     with patch("app.core.scheduler.apply_retention_all") as mock_retention:
         mock_retention.side_effect = Exception("Test error")
         
-        # Mock get_session to return our test db_session
-        with patch("app.core.db.get_session") as mock_get_session:
-            mock_get_session.return_value = iter([db_session])
-            execute_maintenance_job(job_id)
+        execute_maintenance_job(job_id)
         
         # Check that MaintenanceRun was created with failure status
-        runs = db_session.query(MaintenanceRunModel).filter(
+        run = db_session.query(MaintenanceRunModel).filter(
             MaintenanceRunModel.maintenance_job_id == job_id
-        ).all()
-        assert len(runs) == 1
-        
-        run = runs[0]
-        assert run.status == RunStatus.FAILED.value
+        ).one()
+        assert run.status == _FAILED
         assert run.finished_at is not None
         assert "error" in run.message.lower() or "failed" in run.message.lower()
         
-        import json
         result = json.loads(run.result_json)
         assert "error" in result
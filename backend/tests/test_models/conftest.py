@@ -1,27 +1,11 @@
 from __future__ import annotations
 
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from typing import Callable
 
-from app.core.db import Base
+import pytest
+from sqlalchemy.orm import Session
 
 
 @pytest.fixture()
-def db():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    # Ensure models are imported
-    import app.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
-    try:
-        yield TestingSessionLocal()
-    finally:
-        Base.metadata.drop_all(bind=engine)
-
-
+def db(session_factory: Callable[..., Session]):
+    yield session_factory(expire_on_commit=False)
@@ -13,12 +13,10 @@ def test_job_model(db) -> None:
     )
     db.add(target)
     db.commit()
-    db.refresh(target)
 
     tag = Tag(display_name="Daily Backup")
     db.add(tag)
     db.commit()
-    db.refresh(tag)
     db.add(TargetTag(target_id=target.id, tag_id=tag.id, origin="DIRECT"))
     db.commit()
 
@@ -30,7 +28,6 @@ def test_job_model(db) -> None:
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
 
     assert job.id is not None
     assert job.tag_id == tag.id
@@ -43,12 +40,10 @@ def test_job_boolean_enabled_and_cron_validation(db) -> None:
     tag = Tag(display_name="C")
     db.add(tag)
     db.commit()
-    db.refresh(tag)
 
     j = Job(tag_id=tag.id, name="J1", schedule_cron="0 2 * * *", enabled=True)
     db.add(j)
     db.commit()
-    db.refresh(j)
     assert j.enabled is True
 
     bad = Job(tag_id=tag.id, name="J2", schedule_cron="BAD CRON", enabled=False)
@@ -8,12 +8,17 @@ from sqlalchemy.orm import Session
 from app.models import MaintenanceJob as MaintenanceJobModel, MaintenanceRun as MaintenanceRunModel
 from app.domain.enums import RunStatus, MaintenanceJobType
 
+_RC = MaintenanceJobType.RETENTION_CLEANUP.value
+_OK = RunStatus.SUCCESS.value
+_FAILED = RunStatus.FAILED.value
+_RUNNING = RunStatus.RUNNING.value
+
 
 def test_maintenance_job_creation(db: Session):
     """Test creating a MaintenanceJob."""
     job = MaintenanceJobModel(
         key="test_retention_cleanup",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Retention Cleanup",
         schedule_cron="0 3 * * *",
         enabled=True,
@@ -21,11 +26,10 @@ def test_maintenance_job_creation(db: Session):
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
     
     assert job.id is not None
     assert job.key == "test_retention_cleanup"
-    assert job.job_type == MaintenanceJobType.RETENTION_CLEANUP.value
+    assert job.job_type == _RC
     assert job.name == "Test Retention Cleanup"
     assert job.schedule_cron == "0 3 * * *"
     assert job.enabled is True
@@ -36,7 +40,7 @@ def test_maintenance_job_key_unique(db: Session):
     """Test that MaintenanceJob.key must be unique."""
     job1 = MaintenanceJobModel(
         key="unique_key",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Job 1",
         schedule_cron="0 3 * * *",
     )
@@ -45,7 +49,7 @@ def test_maintenance_job_key_unique(db: Session):
     
     job2 = MaintenanceJobModel(
         key="unique_key",  # Same key
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Job 2",
         schedule_cron="0 4 * * *",
     )
@@ -59,26 +63,24 @@ def test_maintenance_run_creation(db: Session):
     """Test creating a MaintenanceRun."""
     job = MaintenanceJobModel(
         key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Job",
         schedule_cron="0 3 * * *",
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
     
     run = MaintenanceRunModel(
         maintenance_job_id=job.id,
-        status=RunStatus.RUNNING.value,
+        status=_RUNNING,
         message="Test run",
     )
     db.add(run)
     db.commit()
-    db.refresh(run)
     
     assert run.id is not None
     assert run.maintenance_job_id == job.id
-    assert run.status == RunStatus.RUNNING.value
+    assert run.status == _RUNNING
     assert run.message == "Test run"
     assert run.started_at is not None
 
@@ -87,46 +89,43 @@ def test_maintenance_job_runs_relationship(db: Session):
     """Test MaintenanceJob.runs relationship."""
     job = MaintenanceJobModel(
         key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Job",
         schedule_cron="0 3 * * *",
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
     
     run1 = MaintenanceRunModel(
         maintenance_job_id=job.id,
-        status=RunStatus.SUCCESS.value,
+        status=_OK,
     )
     run2 = MaintenanceRunModel(
         maintenance_job_id=job.id,
-        status=RunStatus.FAILED.value,
+        status=_FAILED,
     )
     db.add(run1)
     db.add(run2)
     db.commit()
     
-    db.refresh(job)
     assert len(job.runs) == 2
-    assert {r.status for r in job.runs} == {RunStatus.SUCCESS.value, RunStatus.FAILED.value}
+    assert {r.status for r in job.runs} == {_OK, _FAILED}
 
 
 def test_maintenance_run_cascade_delete(db: Session):
     """Test that deleting MaintenanceJob cascades to MaintenanceRun."""
     job = MaintenanceJobModel(
         key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        job_type=_RC,
         name="Test Job",
         schedule_cron="0 3 * * *",
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
     
     run = MaintenanceRunModel(
         maintenance_job_id=job.id,
-        status=RunStatus.SUCCESS.value,
+        status=_OK,
     )
     db.add(run)
     db.commit()
@@ -12,13 +12,11 @@ def test_run_model(db) -> None:
     )
     db.add(target)
     db.commit()
-    db.refresh(target)
 
     # Tag + job by tag
     tag = Tag(display_name="Daily Backup")
     db.add(tag)
     db.commit()
-    db.refresh(tag)
     db.add(TargetTag(target_id=target.id, tag_id=tag.id, origin="DIRECT"))
     db.commit()
 
@@ -30,7 +28,6 @@ def test_run_model(db) -> None:
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
 
     run = Run(
         job_id=job.id,
@@ -41,7 +38,6 @@ def test_run_model(db) -> None:
 
     db.add(run)
     db.commit()
-    db.refresh(run)
 
     assert run.id is not None
     assert run.job_id == job.id
@@ -10,7 +10,6 @@ def test_tag_normalization_and_uniqueness(db) -> None:
     t1 = Tag(display_name="  Prod  ")
     db.add(t1)
     db.commit()
-    db.refresh(t1)
     assert t1.slug == "prod"
     assert t1.display_name == "  Prod  "
 
@@ -22,7 +21,6 @@ def test_tag_normalization_and_uniqueness(db) -> None:
 
     t1.display_name = "Prod-DB"
     db.commit()
-    db.refresh(t1)
     assert t1.slug == "prod-db"
 
     with pytest.raises(ValidationError422):
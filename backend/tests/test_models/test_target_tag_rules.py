@@ -10,31 +10,31 @@ def test_target_tags_provenance_rules(db) -> None:
     tag = Tag(display_name="A")
     tgt = Target(name="T1", slug="t1")
     db.add_all([g, tag, tgt])
-    db.commit()
+    db.flush()
 
     tt = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="GROUP", source_group_id=None)
-    db.add(tt)
     with pytest.raises(Exception):
-        db.flush()
-    db.rollback()
+        with db.begin_nested():
+            db.add(tt)
+            db.flush()
 
     tt = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="AUTO", source_group_id=g.id)
-    db.add(tt)
     with pytest.raises(Exception):
-        db.flush()
-    db.rollback()
+        with db.begin_nested():
+            db.add(tt)
+            db.flush()
 
     tt = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="DIRECT", source_group_id=g.id)
-    db.add(tt)
     with pytest.raises(Exception):
-        db.flush()
-    db.rollback()
+        with db.begin_nested():
+            db.add(tt)
+            db.flush()
 
     ok1 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="AUTO", is_auto_tag=True)
     ok2 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="DIRECT")
     ok3 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="GROUP", source_group_id=g.id)
     db.add_all([ok1, ok2, ok3])
-    db.commit()
+    db.flush()
 
 
 def test_target_tags_uniqueness_by_origin(db) -> None:
@@ -42,20 +42,18 @@ def test_target_tags_uniqueness_by_origin(db) -> None:
     tag = Tag(display_name="B")
     tgt = Target(name="T2", slug="t2")
     db.add_all([g, tag, tgt])
-    db.commit()
+    db.flush()
 
     d1 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="DIRECT")
     db.add(d1)
-    db.commit()
+    db.flush()
 
     d2 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="DIRECT")
-    db.add(d2)
     with pytest.raises(Exception):
-        db.commit()
-    db.rollback()
+        with db.begin_nested():
+            db.add(d2)
+            db.flush()
 
     g1 = TargetTag(target_id=tgt.id, tag_id=tag.id, origin="GROUP", source_group_id=g.id)
     db.add(g1)
-    db.commit()
-
-
+    db.flush()
@@ -1,41 +1,40 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import pytest
 
 from app.schemas import JobCreate, JobUpdate, Job
 
-
-def test_job_create_schema() -> None:
-    data = {
-        "tag_id": 1,
-        "name": "Daily Backup",
-        "schedule_cron": "0 2 * * *",
-        "enabled": True,
-    }
-    job = JobCreate(**data)
-    assert job.enabled is True
-
-
-def test_job_update_schema() -> None:
-    update = JobUpdate(name="Weekly Backup", schedule_cron="0 2 * * 0", enabled=False)
-    assert update.name == "Weekly Backup"
-    assert update.schedule_cron == "0 2 * * 0"
-    assert update.enabled is False
-
-
-def test_job_response_schema() -> None:
-    now = datetime.now(timezone.utc)
-    data = {
-        "id": 1,
-        "tag_id": 1,
-        "name": "Daily Backup",
-        "schedule_cron": "0 2 * * *",
-        "enabled": True,
-        "created_at": now,
-        "updated_at": now,
-    }
-    job = Job(**data)
-    assert job.id == 1
-    assert job.tag_id == 1
-
-
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_CREATE_DATA = {
+    "tag_id": 1,
+    "name": "Daily Backup",
+    "schedule_cron": "0 2 * * *",
+    "enabled": True,
+}
+
+_UPDATE_DATA = {"name": "Weekly Backup", "schedule_cron": "0 2 * * 0", "enabled": False}
+
+_RESPONSE_DATA = {
+    "id": 1,
+    "tag_id": 1,
+    "name": "Daily Backup",
+    "schedule_cron": "0 2 * * *",
+    "enabled": True,
+    "created_at": _NOW,
+    "updated_at": _NOW,
+}
+
+# (schema, payload, fields expected on the validated model)
+CASES = [
+    pytest.param(JobCreate, _CREATE_DATA, {"enabled": True}, id="create"),
+    pytest.param(JobUpdate, _UPDATE_DATA, _UPDATE_DATA, id="update"),
+    pytest.param(Job, _RESPONSE_DATA, {"id": 1, "tag_id": 1}, id="response"),
+]
+
+
+@pytest.mark.parametrize("cls,data,expected", CASES)
+def test_job_schema(cls, data, expected) -> None:
+    obj = cls.model_validate(data)
+    assert obj.model_dump(include=set(expected)) == expected
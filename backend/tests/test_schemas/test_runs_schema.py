@@ -2,58 +2,65 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import pytest
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.schemas import RunCreate, RunUpdate, Run
 
+FAKE_SHA = "a" * 64
+_RUN_CREATE = TypeAdapter(RunCreate)
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-def test_run_create_schema() -> None:
-    data = {
-        "job_id": 1,
-        "status": "running",
-        "message": "Starting backup...",
-        "artifact_path": "/backups/test.sql",
-        "artifact_bytes": 1024,
-        "sha256": "a" * 64,
-        "logs_text": "Starting backup...\nDone",
-    }
-    run = RunCreate(**data)
-    assert run.job_id == 1
-    assert run.status == "running"
-
-
-def test_run_update_schema() -> None:
-    now = datetime.now(timezone.utc)
-    update = RunUpdate(status="success", finished_at=now, message="ok")
-    assert update.status == "success"
-    assert update.finished_at == now
-
-
-def test_run_response_schema() -> None:
-    started_at = datetime.now(timezone.utc)
-    finished_at = datetime.now(timezone.utc)
-    data = {
-        "id": 1,
-        "job_id": 1,
-        "started_at": started_at,
-        "finished_at": finished_at,
-        "status": "success",
-        "message": "OK",
-        "artifact_path": "/backups/test.sql",
-        "artifact_bytes": 100,
-        "sha256": "a" * 64,
-        "logs_text": "log",
-        "display_job_name": "Test Job",
-        "display_tag_name": "test-tag",
-    }
-    run = Run(**data)
-    assert run.id == 1
-    assert run.job_id == 1
-    assert run.display_job_name == "Test Job"
-
-
-def test_run_invalid_data_validation() -> None:
-    with pytest.raises(ValidationError):
-        RunCreate(job_id="not_int", status="running")  # type: ignore[arg-type]
+_CREATE_DATA = {
+    "job_id": 1,
+    "status": "running",
+    "message": "Starting backup...",
+    "artifact_path": "/backups/test.sql",
+    "artifact_bytes": 1024,
+    "sha256": FAKE_SHA,
+    "logs_text": "Starting backup...\nDone",
+}
+
+_UPDATE_DATA = {"status": "success", "finished_at": _NOW, "message": "ok"}
+
+_RESPONSE_DATA = {
+    "id": 1,
+    "job_id": 1,
+    "started_at": _NOW,
+    "finished_at": _NOW,
+    "status": "success",
+    "message": "OK",
+    "artifact_path": "/backups/test.sql",
+    "artifact_bytes": 100,
+    "sha256": FAKE_SHA,
+    "logs_text": "log",
+    "display_job_name": "Test Job",
+    "display_tag_name": "test-tag",
+}
+
+# (schema, payload, fields expected on the validated model)
+CASES = [
+    pytest.param(RunCreate, _CREATE_DATA, {"job_id": 1, "status": "running"}, id="create"),
+    pytest.param(RunUpdate, _UPDATE_DATA, {"status": "success", "finished_at": _NOW}, id="update"),
+    pytest.param(
+        Run, _RESPONSE_DATA, {"id": 1, "job_id": 1, "display_job_name": "Test Job"}, id="response"
+    ),
+]
 
 
+@pytest.mark.parametrize("cls,data,expected", CASES)
+def test_run_schema(cls, data, expected) -> None:
+    obj = cls.model_validate(data)
+    assert obj.model_dump(include=set(expected)) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param({"job_id": "not_int", "status": "running"}, id="job_id-not-int"),
+        pytest.param({"job_id": 1}, id="missing-status"),
+        pytest.param({"job_id": 1, "status": "bogus"}, id="unknown-status"),
+    ],
+)
+def test_run_invalid_data_validation(data) -> None:
+    with pytest.raises(ValidationError):
+        _RUN_CREATE.validate_python(data)
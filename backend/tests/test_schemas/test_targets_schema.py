@@ -2,48 +2,57 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import pytest
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.schemas import TargetCreate, TargetUpdate, Target
 
-
-def test_target_create_schema() -> None:
-    data = {
-        "name": "Pi-hole",
-        "slug": "pihole",
-        "plugin_name": "pihole",
-        "plugin_config_json": "{}",
-    }
-    target = TargetCreate(**data)
-    assert target.name == "Pi-hole"
-    assert target.plugin_name == "pihole"
-
-
-def test_target_update_schema() -> None:
-    update = TargetUpdate(name="New Name")
-    assert update.name == "New Name"
-    assert update.plugin_name is None
-
-
-def test_target_response_schema() -> None:
-    now = datetime.now(timezone.utc)
-    data = {
-        "id": 1,
-        "name": "Pi-hole",
-        "slug": "pihole",
-        "plugin_name": "pihole",
-        "plugin_config_json": "{}",
-        "created_at": now,
-        "updated_at": now,
-    }
-    target = Target(**data)
-    assert target.id == 1
-    assert target.created_at == now
-
-
-def test_invalid_target_data_validation() -> None:
-    with pytest.raises(ValidationError):
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_TARGET_CREATE = TypeAdapter(TargetCreate)
+
+_CREATE_DATA = {
+    "name": "Pi-hole",
+    "slug": "pihole",
+    "plugin_name": "pihole",
+    "plugin_config_json": "{}",
+}
+
+_RESPONSE_DATA = {
+    "id": 1,
+    "name": "Pi-hole",
+    "slug": "pihole",
+    "plugin_name": "pihole",
+    "plugin_config_json": "{}",
+    "created_at": _NOW,
+    "updated_at": _NOW,
+}
+
+# (schema, payload, fields expected on the validated model)
+CASES = [
+    pytest.param(
+        TargetCreate, _CREATE_DATA, {"name": "Pi-hole", "plugin_name": "pihole"}, id="create"
+    ),
+    pytest.param(
+        TargetUpdate, {"name": "New Name"}, {"name": "New Name", "plugin_name": None}, id="update"
+    ),
+    pytest.param(Target, _RESPONSE_DATA, {"id": 1, "created_at": _NOW}, id="response"),
+]
+
+
+@pytest.mark.parametrize("cls,data,expected", CASES)
+def test_target_schema(cls, data, expected) -> None:
+    obj = cls.model_validate(data)
+    assert obj.model_dump(include=set(expected)) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
         # Missing plugin fields should raise in TargetCreate
-        TargetCreate(name="X")  # type: ignore[call-arg]
-
-
+        pytest.param({"name": "X"}, id="missing-plugin"),
+        pytest.param({"name": "X", "plugin_name": "pihole"}, id="missing-plugin-config"),
+        pytest.param({"plugin_name": "pihole", "plugin_config_json": "{}"}, id="missing-name"),
+    ],
+)
+def test_invalid_target_data_validation(data) -> None:
+    with pytest.raises(ValidationError):
+        _TARGET_CREATE.validate_python(data)
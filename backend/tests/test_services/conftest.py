@@ -1,27 +1,22 @@
 from __future__ import annotations
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session
 
-from app.core.db import Base
+from app.services import GroupService, TargetService
 
 
 @pytest.fixture()
-def db():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    # Ensure models are imported
-    import app.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
-    try:
-        yield TestingSessionLocal()
-    finally:
-        Base.metadata.drop_all(bind=engine)
+def db(session: Session) -> Session:
+    """Service tests share the root SAVEPOINT-isolated session on the one schema."""
+    return session
 
 
+@pytest.fixture()
+def gsvc(db: Session) -> GroupService:
+    return GroupService(db)
+
+
+@pytest.fixture()
+def tsvc(db: Session) -> TargetService:
+    return TargetService(db)
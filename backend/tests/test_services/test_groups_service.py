@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+from sqlalchemy import func
+
 from app.models import TargetTag, Target, Tag, GroupTag, slugify
-from app.services import GroupService, TargetService
 
 
-def test_group_add_remove_tags_propagates(db):
-    gsvc = GroupService(db)
-    tsvc = TargetService(db)
+def _group_origin_counts(db, group_id: int) -> dict[int, int]:
+    """Map target_id -> number of GROUP-origin tag rows sourced from ``group_id``."""
+    rows = (
+        db.query(TargetTag.target_id, func.count())
+        .filter(TargetTag.origin == "GROUP", TargetTag.source_group_id == group_id)
+        .group_by(TargetTag.target_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def test_group_add_remove_tags_propagates(db, gsvc, tsvc):
     # Create group and targets
     g = gsvc.create("G1")
     a = tsvc.create(name="A", plugin_name="p", plugin_config_json="{}")
@@ -20,37 +30,15 @@ def test_group_add_remove_tags_propagates(db):
     assert norms == ["db", "prod"]
 
     # Both targets should have GROUP-origin rows for the group's auto-tag plus each added tag
-    for tgt in (a, b):
-        rows = (
-            db.query(TargetTag)
-            .filter(
-                TargetTag.target_id == tgt.id,
-                TargetTag.origin == "GROUP",
-                TargetTag.source_group_id == g.id,
-            )
-            .all()
-        )
-        assert len(rows) == 3
+    assert _group_origin_counts(db, g.id) == {a.id: 3, b.id: 3}
 
     # Removing one tag de-propagates
     gsvc.remove_tags(g.id, ["prod"])  # by normalized name
-    for tgt in (a, b):
-        rows = (
-            db.query(TargetTag)
-            .filter(
-                TargetTag.target_id == tgt.id,
-                TargetTag.origin == "GROUP",
-                TargetTag.source_group_id == g.id,
-            )
-            .all()
-        )
-        # Group auto-tag + "db" remain
-        assert len(rows) == 2
-
-
-def test_group_add_remove_targets_moves_and_adjusts_group_origin(db):
-    gsvc = GroupService(db)
-    tsvc = TargetService(db)
+    # Group auto-tag + "db" remain
+    assert _group_origin_counts(db, g.id) == {a.id: 2, b.id: 2}
+
+
+def test_group_add_remove_targets_moves_and_adjusts_group_origin(db, gsvc, tsvc):
     # Groups and tags
     g1 = gsvc.create("G1")
     g2 = gsvc.create("G2")
@@ -77,9 +65,7 @@ def test_group_add_remove_targets_moves_and_adjusts_group_origin(db):
 
 
 
-def test_delete_group_detaches_targets_and_cleans_group_origin_tags(db):
-    gsvc = GroupService(db)
-    tsvc = TargetService(db)
+def test_delete_group_detaches_targets_and_cleans_group_origin_tags(db, gsvc, tsvc):
     # Setup: group with two targets and two tags propagated (plus the group's auto-tag)
     g = gsvc.create("G")
     t1 = tsvc.create(name="T1", plugin_name="p", plugin_config_json="{}")
@@ -87,12 +73,7 @@ def test_delete_group_detaches_targets_and_cleans_group_origin_tags(db):
     gsvc.add_targets(g.id, [t1.id, t2.id])
     gsvc.add_tags(g.id, ["prod", "db"])  # two tags + group's auto-tag -> 6 GROUP-origin rows
 
-    assert (
-        db.query(TargetTag)
-        .filter(TargetTag.origin == "GROUP", TargetTag.source_group_id == g.id)
-        .count()
-        == 6
-    )
+    assert _group_origin_counts(db, g.id) == {t1.id: 3, t2.id: 3}
 
     # Delete the non-empty group
     ok = gsvc.delete(g.id)
@@ -106,16 +87,10 @@ def test_delete_group_detaches_targets_and_cleans_group_origin_tags(db):
     assert t2_db is not None and t2_db.group_id is None
 
     # All GROUP-origin rows referencing the deleted group are removed
-    assert (
-        db.query(TargetTag)
-        .filter(TargetTag.origin == "GROUP", TargetTag.source_group_id == g.id)
-        .count()
-        == 0
-    )
+    assert _group_origin_counts(db, g.id) == {}
 
 
-def test_group_create_creates_auto_tag_and_links(db):
-    gsvc = GroupService(db)
+def test_group_create_creates_auto_tag_and_links(db, gsvc):
     g = gsvc.create("Ops Team")
 
     expected_slug = slugify("Ops Team")
@@ -131,14 +106,12 @@ def test_group_create_creates_auto_tag_and_links(db):
     assert link is not None
 
 
-def test_group_create_reuses_existing_tag_by_slug(db):
+def test_group_create_reuses_existing_tag_by_slug(db, gsvc):
     # Pre-create tag that matches the group's slugified name
     t = Tag(display_name="Eng Team")
     db.add(t)
     db.commit()
-    db.refresh(t)
 
-    gsvc = GroupService(db)
     g = gsvc.create("Eng Team")
 
     # Tag reused; link exists
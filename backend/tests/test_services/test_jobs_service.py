@@ -1,86 +1,111 @@
 from __future__ import annotations
 
 import threading
-import time
-from typing import Generator, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Generator, List, Dict, Any
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 
-from app.core.db import Base
-from app.models import Target, Tag, TargetTag, Job
+import app.core.db as db_mod
+import app.core.scheduler as sched_mod
+from app.models import Target, Tag, TargetTag, Job, Run, ValidationError422
 from app.services.jobs import JobService, resolve_tag_to_targets, run_job_for_tag
 
 
-@pytest.fixture
-def session() -> Generator[Session, None, None]:
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    # Ensure models are registered before creating tables
-    import app.models  # noqa: F401
-
-    Base.metadata.create_all(bind=engine)
-
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
-
 # Factories
 
 def make_target(db: Session, name: str) -> Target:
     t = Target(name=name, slug=name.lower(), plugin_name="dummy", plugin_config_json="{}")
     db.add(t)
-    db.commit()
-    db.refresh(t)
+    db.flush()
     return t
 
 
+def make_targets(db: Session, names: list[str]) -> list[Target]:
+    # ORM bulk INSERT ... RETURNING: one statement, slugs precomputed so the
+    # before_insert slug hook is not needed
+    rows = [{"name": n, "slug": n.lower(), "plugin_name": "dummy", "plugin_config_json": "{}"} for n in names]
+    return list(db.scalars(insert(Target).returning(Target, sort_by_parameter_order=True), rows))
+
+
 def make_tag(db: Session, name: str) -> Tag:
     tag = Tag(display_name=name)
     db.add(tag)
-    db.commit()
-    db.refresh(tag)
+    db.flush()
     return tag
 
 
 def attach(db: Session, target: Target, tag: Tag, origin: str, source_group_id: int | None = None, is_auto: bool = False) -> TargetTag:
     tt = TargetTag(target_id=target.id, tag_id=tag.id, origin=origin, source_group_id=source_group_id, is_auto_tag=is_auto)
     db.add(tt)
-    db.commit()
-    db.refresh(tt)
+    db.flush()
     return tt
 
 
+def attach_many(db: Session, targets: list[Target], tag: Tag, origin: str) -> None:
+    # Bulk insert skips the TargetTag validation hook; only pass AUTO/DIRECT here
+    db.execute(
+        insert(TargetTag),
+        [{"target_id": t.id, "tag_id": tag.id, "origin": origin, "is_auto_tag": False} for t in targets],
+    )
+
+
 def make_job(db: Session, tag: Tag, name: str = "J", cron: str = "* * * * *", enabled: bool = True) -> Job:
     job = Job(tag_id=tag.id, name=name, schedule_cron=cron, enabled=enabled)
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    db.flush()
     return job
 
 
+class _SuccessPlugin:
+    """Stub plugin whose backups succeed with a synthetic artifact path."""
+
+    def __init__(self, artifact_path: str) -> None:
+        self.artifact_path = artifact_path
+
+    async def validate_config(self, config): return True
+    async def test(self, config): return True
+    async def backup(self, context):
+        return {"artifact_path": self.artifact_path}
+    async def restore(self, context): return {"ok": True}
+    async def get_status(self, context): return {"ok": True}
+
+
+class _FailingPlugin:
+    """Stub plugin whose backups always raise."""
+
+    async def validate_config(self, config): return True
+    async def test(self, config): return True
+    async def backup(self, context):
+        raise RuntimeError("Plugin backup failed")
+    async def restore(self, context): return {"ok": True}
+    async def get_status(self, context): return {"ok": True}
+
+
+@pytest.fixture(scope="module")
+def success_plugin(artifact_dir: Path) -> _SuccessPlugin:
+    # Never created on disk, so the scheduler skips sizing and hashing it
+    return _SuccessPlugin(str(artifact_dir / "backup-test.txt"))
+
+
+@pytest.fixture(scope="module")
+def plugin_factory(success_plugin: _SuccessPlugin) -> Callable[[str], object]:
+    """Look up a shared stub plugin by kind: ``"success"`` or ``"fail"``."""
+    return {"success": success_plugin, "fail": _FailingPlugin()}.__getitem__
+
+
 # Tests
 
-def test_job_create_requires_existing_tag_and_valid_cron(session: Session) -> None:
+def test_job_create_requires_existing_tag(session: Session) -> None:
     svc = JobService(session)
     # Unknown tag id
-    with pytest.raises(KeyError):
+    with pytest.raises(KeyError, match="tag_not_found"):
         svc.create(tag_id=9999, name="X", schedule_cron="* * * * *", enabled=True)
-    # Create tag and bad cron
     t = make_tag(session, "Prod")
-    with pytest.raises(Exception):
-        svc.create(tag_id=t.id, name="X", schedule_cron="invalid CRON BAD", enabled=True)
     # Good
     job = svc.create(tag_id=t.id, name="Y", schedule_cron="*/5 * * * *", enabled=True)
     assert job.id > 0 and job.tag_id == t.id
@@ -91,12 +116,8 @@ def test_job_update_validates_fields(session: Session) -> None:
     tg = make_tag(session, "Tag1")
     job = svc.create(tag_id=tg.id, name="A", schedule_cron="* * * * *", enabled=True)
 
-    # Update to bad cron
-    with pytest.raises(Exception):
-        svc.update(job.id, schedule_cron="BAD expr")
-
     # Update to unknown tag
-    with pytest.raises(KeyError):
+    with pytest.raises(KeyError, match="tag_not_found"):
         svc.update(job.id, tag_id=999999)
 
     # Valid update
@@ -104,6 +125,18 @@ def test_job_update_validates_fields(session: Session) -> None:
     assert job2.name == "B"
 
 
+@pytest.mark.parametrize("bad_cron", ["invalid CRON BAD", "BAD expr", "   "])
+def test_job_create_and_update_reject_invalid_cron(session: Session, bad_cron: str) -> None:
+    svc = JobService(session)
+    tag = make_tag(session, "Cron")
+    with pytest.raises(ValidationError422, match="Invalid cron expression"):
+        svc.create(tag_id=tag.id, name="X", schedule_cron=bad_cron, enabled=True)
+
+    job = svc.create(tag_id=tag.id, name="Y", schedule_cron="* * * * *", enabled=True)
+    with pytest.raises(ValidationError422, match="Invalid cron expression"):
+        svc.update(job.id, schedule_cron=bad_cron)
+
+
 def test_resolve_tag_to_targets_dedupes_origins(session: Session) -> None:
     tag = make_tag(session, "Prod")
     a = make_target(session, "A")
@@ -119,46 +152,63 @@ def test_resolve_tag_to_targets_dedupes_origins(session: Session) -> None:
     assert ids == {a.id, b.id}
 
 
-def test_no_overlap_skip_when_running(session: Session) -> None:
-    tag = make_tag(session, "T")
-    targets = [make_target(session, f"T{i}") for i in range(2)]
-    for t in targets:
-        attach(session, t, tag, origin="DIRECT")
-    job = make_job(session, tag, name="Overlap")
-
-    # Runner that blocks for a moment
-    def runner(_t: Target) -> dict:
-        time.sleep(0.2)
-        return {"ok": True}
-
-    # Start first run in background
-    results_holder: dict[str, Any] = {}
-
-    def bg() -> None:
-        results_holder["first"] = run_job_for_tag(session, job.id, tag.id, runner=runner, max_concurrency=1, no_overlap=True)
-
-    th = threading.Thread(target=bg)
-    th.start()
-    time.sleep(0.05)
-
-    # Second run should skip
-    second = run_job_for_tag(session, job.id, tag.id, runner=runner, max_concurrency=1, no_overlap=True)
-    th.join()
+def test_no_overlap_skip_when_running(fresh_engine: Engine) -> None:
+    # Real threads need their own DBAPI connections, so use a pooled engine on
+    # this test's private database file with committed fixtures
+    engine = create_engine(fresh_engine.url, connect_args={"check_same_thread": False})
+    try:
+        with Session(engine) as setup:
+            tag = make_tag(setup, "T")
+            targets = make_targets(setup, [f"T{i}" for i in range(2)])
+            attach_many(setup, targets, tag, origin="DIRECT")
+            job = make_job(setup, tag, name="Overlap")
+            setup.commit()
+            job_id, tag_id = job.id, tag.id
+
+        started = threading.Event()
+        release = threading.Event()
+
+        # Runner that holds the job lock until the test releases it
+        def runner(_t: Target) -> dict:
+            started.set()
+            release.wait(timeout=5)
+            return {"ok": True}
+
+        def run() -> dict:
+            with Session(engine) as db:
+                return run_job_for_tag(db, job_id, tag_id, runner=runner, max_concurrency=1, no_overlap=True)
+
+        # Start first run in background; the Future surfaces its result or exception
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            fut = pool.submit(run)
+            assert started.wait(timeout=5)
+
+            # Second run should skip while the first still holds the lock
+            try:
+                second = run()
+            finally:
+                release.set()
+            first = fut.result(timeout=5)
+    finally:
+        engine.dispose()
 
-    assert results_holder["first"]["started"] is True
+    assert first["started"] is True
+    assert len(first["results"]) == 2
     assert second["started"] is False and second["results"] == []
 
 
 def test_bounded_concurrency(session: Session) -> None:
     tag = make_tag(session, "P")
-    targets = [make_target(session, f"N{i}") for i in range(10)]
-    for t in targets:
-        attach(session, t, tag, origin="DIRECT")
+    # A multiple of max_concurrency so every barrier round fills up
+    targets = make_targets(session, [f"N{i}" for i in range(9)])
+    attach_many(session, targets, tag, origin="DIRECT")
     job = make_job(session, tag, name="Conc")
 
     concurrent = 0
     max_seen = 0
     lock = threading.Lock()
+    # Only passes once three runners are in flight at the same time
+    barrier = threading.Barrier(3, timeout=5)
 
     def runner(_t: Target) -> dict:
         nonlocal concurrent, max_seen
@@ -166,34 +216,38 @@ def test_bounded_concurrency(session: Session) -> None:
             concurrent += 1
             if concurrent > max_seen:
                 max_seen = concurrent
-        time.sleep(0.05)
+        barrier.wait()
         with lock:
             concurrent -= 1
         return {"ok": True}
 
-    out = run_job_for_tag(session, job.id, tag.id, runner=runner, max_concurrency=3, no_overlap=True)
+    out = run_job_for_tag(session, job.id, tag.id, runner=runner, max_concurrency=3, no_overlap=True, max_retries=0)
     assert out["started"] is True
-    assert max_seen <= 3
+    assert all(r["status"] == "success" for r in out["results"])
+    assert max_seen == 3
 
 
 def test_per_target_retry_with_backoff(session: Session) -> None:
     tag = make_tag(session, "R")
-    targets = [make_target(session, f"X{i}") for i in range(3)]
-    for t in targets:
-        attach(session, t, tag, origin="DIRECT")
+    targets = make_targets(session, [f"X{i}" for i in range(3)])
+    attach_many(session, targets, tag, origin="DIRECT")
     job = make_job(session, tag, name="Retry")
 
+    backoff_base = 0.001
     attempts: Dict[int, int] = {}
-    sleeps: list[float] = []
+    # Workers interleave, so delays are tracked per target via the worker thread
+    current = threading.local()
+    sleeps: Dict[int, list[float]] = {t.id: [] for t in targets}
 
     def fake_sleep(d: float) -> None:
-        sleeps.append(d)
+        sleeps[current.target_id].append(d)
 
     def runner(t: Target) -> dict:
+        current.target_id = t.id
         cnt = attempts.get(t.id, 0)
         attempts[t.id] = cnt + 1
-        if cnt == 0:
-            raise RuntimeError("fail-once")
+        if cnt < 2:
+            raise RuntimeError("fail-twice")
         return {"ok": True}
 
     out = run_job_for_tag(
@@ -203,151 +257,60 @@ def test_per_target_retry_with_backoff(session: Session) -> None:
         runner=runner,
         max_concurrency=2,
         no_overlap=True,
-        max_retries=1,
+        max_retries=2,
         sleep_fn=fake_sleep,
-        backoff_base=0.001,
+        backoff_base=backoff_base,
     )
     assert out["started"] is True
-    # Each target should have attempted twice total (1 fail + 1 success)
-    assert all(attempts[t.id] == 2 for t in targets)
-    # Backoff called for each initial failure
-    assert len(sleeps) == len(targets)
-
-
-def test_job_create_adds_to_scheduler(monkeypatch, session):
-    """Test that creating a job automatically adds it to the scheduler."""
-    from app.core.scheduler import reschedule_job
-    
-    # Mock the reschedule_job function
-    mock_calls = []
-    def mock_reschedule_job(job_id, schedule_cron, enabled):
-        mock_calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
-        return True
-    
-    monkeypatch.setattr("app.core.scheduler.reschedule_job", mock_reschedule_job)
-    
-    svc = JobService(session)
-    tag = make_tag(session, "TestTag")
-    
-    # Create enabled job
-    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=True)
-    
-    # Verify scheduler was called
-    assert len(mock_calls) == 1
-    assert mock_calls[0]["job_id"] == job.id
-    assert mock_calls[0]["schedule_cron"] == "0 2 * * *"
-    assert mock_calls[0]["enabled"] is True
+    assert all(r["status"] == "success" for r in out["results"])
+    # Each target should have attempted three times total (2 fails + 1 success)
+    assert all(attempts[t.id] == 3 for t in targets)
+    # Backoff doubles per attempt: base * 2**0, base * 2**1
+    expected = [pytest.approx(backoff_base * 2**i) for i in range(2)]
+    assert all(sleeps[t.id] == expected for t in targets)
 
 
-def test_job_create_disabled_does_not_add_to_scheduler(monkeypatch, session):
-    """Test that creating a disabled job does not add it to scheduler."""
-    from app.core.scheduler import reschedule_job
-    
-    # Mock the reschedule_job function
-    mock_calls = []
-    def mock_reschedule_job(job_id, schedule_cron, enabled):
-        mock_calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
-        return True
-    
-    monkeypatch.setattr("app.core.scheduler.reschedule_job", mock_reschedule_job)
-    
-    svc = JobService(session)
-    tag = make_tag(session, "TestTag")
-    
-    # Create disabled job
-    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=False)
-    
-    # Verify scheduler was not called
-    assert len(mock_calls) == 0
-
+@pytest.fixture()
+def reschedule_calls(monkeypatch) -> list[dict]:
+    """Record reschedule_job calls made by JobService instead of touching the scheduler."""
+    calls: list[dict] = []
 
-def test_job_update_schedule_cron_updates_scheduler(monkeypatch, session):
-    """Test that updating job cron automatically updates scheduler."""
-    from app.core.scheduler import reschedule_job
-    
-    # Mock the reschedule_job function
-    mock_calls = []
     def mock_reschedule_job(job_id, schedule_cron, enabled):
-        mock_calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
+        calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
         return True
-    
-    monkeypatch.setattr("app.core.scheduler.reschedule_job", mock_reschedule_job)
-    
-    svc = JobService(session)
-    tag = make_tag(session, "TestTag")
-    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=True)
-    
-    # Clear mock calls from create
-    mock_calls.clear()
-    
-    # Update cron
-    svc.update(job.id, schedule_cron="0 3 * * *")
-    
-    # Verify scheduler was called with new cron
-    assert len(mock_calls) == 1
-    assert mock_calls[0]["job_id"] == job.id
-    assert mock_calls[0]["schedule_cron"] == "0 3 * * *"
-    assert mock_calls[0]["enabled"] is True
 
-
-def test_job_update_enabled_status_updates_scheduler(monkeypatch, session):
-    """Test that updating job enabled status automatically updates scheduler."""
-    from app.core.scheduler import reschedule_job
-    
-    # Mock the reschedule_job function
-    mock_calls = []
-    def mock_reschedule_job(job_id, schedule_cron, enabled):
-        mock_calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
-        return True
-    
     monkeypatch.setattr("app.core.scheduler.reschedule_job", mock_reschedule_job)
-    
+    return calls
+
+
+@pytest.mark.parametrize(
+    "create_enabled, update, expected",
+    [
+        pytest.param(True, None, [("0 2 * * *", True)], id="create-enabled"),
+        pytest.param(False, None, [], id="create-disabled"),
+        pytest.param(True, {"schedule_cron": "0 3 * * *"}, [("0 3 * * *", True)], id="update-cron"),
+        pytest.param(True, {"enabled": False}, [("0 2 * * *", False)], id="update-enabled"),
+        pytest.param(True, {"name": "NewName"}, [], id="update-other-fields"),
+    ],
+)
+def test_job_changes_sync_scheduler(session, reschedule_calls, create_enabled, update, expected):
+    """Creating or updating a job reschedules it only when its schedule changes."""
     svc = JobService(session)
     tag = make_tag(session, "TestTag")
-    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=True)
-    
-    # Clear mock calls from create
-    mock_calls.clear()
-    
-    # Disable job
-    svc.update(job.id, enabled=False)
-    
-    # Verify scheduler was called with disabled status
-    assert len(mock_calls) == 1
-    assert mock_calls[0]["job_id"] == job.id
-    assert mock_calls[0]["enabled"] is False
+    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=create_enabled)
 
+    if update is not None:
+        # Only the update's calls are under test
+        reschedule_calls.clear()
+        svc.update(job.id, **update)
 
-def test_job_update_other_fields_does_not_update_scheduler(monkeypatch, session):
-    """Test that updating non-schedule fields doesn't trigger scheduler update."""
-    from app.core.scheduler import reschedule_job
-    
-    # Mock the reschedule_job function
-    mock_calls = []
-    def mock_reschedule_job(job_id, schedule_cron, enabled):
-        mock_calls.append({"job_id": job_id, "schedule_cron": schedule_cron, "enabled": enabled})
-        return True
-    
-    monkeypatch.setattr("app.core.scheduler.reschedule_job", mock_reschedule_job)
-    
-    svc = JobService(session)
-    tag = make_tag(session, "TestTag")
-    job = svc.create(tag_id=tag.id, name="TestJob", schedule_cron="0 2 * * *", enabled=True)
-    
-    # Clear mock calls from create
-    mock_calls.clear()
-    
-    # Update name only
-    svc.update(job.id, name="NewName")
-    
-    # Verify scheduler was not called
-    assert len(mock_calls) == 0
+    assert reschedule_calls == [
+        {"job_id": job.id, "schedule_cron": cron, "enabled": enabled} for cron, enabled in expected
+    ]
 
 
 def test_job_delete_removes_from_scheduler(monkeypatch, session):
     """Test that deleting a job automatically removes it from scheduler."""
-    from app.core.scheduler import remove_job
-    
     # Mock the remove_job function
     mock_calls = []
     def mock_remove_job(job_id):
@@ -370,8 +333,6 @@ def test_job_delete_removes_from_scheduler(monkeypatch, session):
 
 def test_scheduler_update_failure_does_not_fail_job_operation(monkeypatch, session):
     """Test that scheduler update failures don't cause job operations to fail."""
-    from app.core.scheduler import reschedule_job
-    
     # Mock reschedule_job to raise an exception
     def mock_reschedule_job(job_id, schedule_cron, enabled):
         raise RuntimeError("Scheduler error")
@@ -395,121 +356,51 @@ def test_scheduler_update_failure_does_not_fail_job_operation(monkeypatch, sessi
     assert session.query(Job).filter(Job.id == job.id).first() is None
 
 
-def test_scheduled_job_execution_success(monkeypatch, session):
-    """Test that _scheduled_job creates run and marks success."""
-    from app.core.scheduler import _scheduled_job
-    from app.core.db import get_session
-    import tempfile
-    
+@pytest.mark.parametrize(
+    "plugin_kind, expected_status",
+    [("success", "success"), ("fail", "failed")],
+)
+def test_scheduled_job_records_run(monkeypatch, session, plugin_factory, plugin_kind, expected_status):
+    """_scheduled_job creates a run and records the plugin outcome."""
     # Mock get_session to return our test session
     def mock_get_session():
         yield session
-    
-    import app.core.db as db_mod
+
     monkeypatch.setattr(db_mod, "get_session", mock_get_session, raising=True)
-    
+
     # Create target and job
     target = make_target(session, "ScheduleTest")
     tag = make_tag(session, "ScheduleTag")
     attach(session, target, tag, origin="DIRECT")
     job = make_job(session, tag, name="ScheduledJob", cron="* * * * *", enabled=True)
-    
-    # Mock successful plugin
-    class SuccessPlugin:
-        async def validate_config(self, config): return True
-        async def test(self, config): return True
-        async def backup(self, context):
-            fd, path = tempfile.mkstemp(prefix="backup-test-", suffix=".txt")
-            return {"artifact_path": path}
-        async def restore(self, context): return {"ok": True}
-        async def get_status(self, context): return {"ok": True}
-    
-    import app.core.scheduler as sched
-    monkeypatch.setattr(sched, "get_plugin", lambda name: SuccessPlugin())
-    
-    # Execute scheduled job
-    _scheduled_job(job.id)
-    
-    # Verify run was created and marked successful
-    from app.models import Run as RunModel
-    runs = session.query(RunModel).filter(RunModel.job_id == job.id).all()
-    assert len(runs) == 1
-    run = runs[0]
-    assert run.status == "success"
-    assert run.started_at is not None
-    assert run.finished_at is not None
 
+    monkeypatch.setattr(sched_mod, "get_plugin", lambda name: plugin_factory(plugin_kind))
 
-def test_scheduled_job_handles_plugin_errors(monkeypatch, session):
-    """Test that _scheduled_job handles plugin errors gracefully."""
-    from app.core.scheduler import _scheduled_job
-    from app.core.db import get_session
-    
-    # Mock get_session to return our test session
-    def mock_get_session():
-        yield session
-    
-    import app.core.db as db_mod
-    monkeypatch.setattr(db_mod, "get_session", mock_get_session, raising=True)
-    
-    # Create target and job
-    target = make_target(session, "ErrorTest")
-    tag = make_tag(session, "ErrorTag")
-    attach(session, target, tag, origin="DIRECT")
-    job = make_job(session, tag, name="ErrorJob", cron="* * * * *", enabled=True)
-    
-    # Mock failing plugin
-    class FailingPlugin:
-        async def validate_config(self, config): return True
-        async def test(self, config): return True
-        async def backup(self, context):
-            raise RuntimeError("Plugin backup failed")
-        async def restore(self, context): return {"ok": True}
-        async def get_status(self, context): return {"ok": True}
-    
-    import app.core.scheduler as sched
-    monkeypatch.setattr(sched, "get_plugin", lambda name: FailingPlugin())
-    
     # Execute scheduled job
-    _scheduled_job(job.id)
-    
-    # Verify run was created and marked failed
-    from app.models import Run as RunModel
-    runs = session.query(RunModel).filter(RunModel.job_id == job.id).all()
-    assert len(runs) == 1
-    run = runs[0]
-    assert run.status == "failed"
+    sched_mod._scheduled_job(job.id)
+
+    by_job = Run.job_id == job.id
+    assert session.scalar(select(func.count()).select_from(Run).where(by_job)) == 1
+    run = session.scalars(select(Run).where(by_job).limit(1)).one()
+    assert run.status == expected_status
     assert run.started_at is not None
     assert run.finished_at is not None
-    assert "failed" in run.message.lower()
+    if expected_status == "failed":
+        assert "failed" in run.message.lower()
 
 
-def test_run_job_immediately_shares_logic_with_scheduled_job(monkeypatch, session):
+def test_run_job_immediately_shares_logic_with_scheduled_job(monkeypatch, session, plugin_factory):
     """Test that run_job_immediately uses the same execution logic."""
-    from app.core.scheduler import run_job_immediately
-    import tempfile
-    
     # Create target and job
     target = make_target(session, "ImmediateTest")
     tag = make_tag(session, "ImmediateTag")
     attach(session, target, tag, origin="DIRECT")
     job = make_job(session, tag, name="ImmediateJob", cron="0 0 * * *", enabled=True)
     
-    # Mock successful plugin
-    class SuccessPlugin:
-        async def validate_config(self, config): return True
-        async def test(self, config): return True
-        async def backup(self, context):
-            fd, path = tempfile.mkstemp(prefix="backup-test-", suffix=".txt")
-            return {"artifact_path": path}
-        async def restore(self, context): return {"ok": True}
-        async def get_status(self, context): return {"ok": True}
-    
-    import app.core.scheduler as sched
-    monkeypatch.setattr(sched, "get_plugin", lambda name: SuccessPlugin())
+    monkeypatch.setattr(sched_mod, "get_plugin", lambda name: plugin_factory("success"))
     
     # Execute job immediately
-    run = run_job_immediately(session, job.id, triggered_by="manual_test")
+    run = sched_mod.run_job_immediately(session, job.id, triggered_by="manual_test")
     
     # Verify run was created successfully
     assert run.job_id == job.id
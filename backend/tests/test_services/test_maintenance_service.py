@@ -2,13 +2,34 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+
 import pytest
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import MaintenanceJob as MaintenanceJobModel, MaintenanceRun as MaintenanceRunModel
 from app.domain.enums import RunStatus, MaintenanceJobType
 from app.services.maintenance import MaintenanceService
 
+# Fixed base for explicit, strictly increasing run start times (naive, as
+# SQLite DateTime columns round-trip them)
+_T0 = datetime(2024, 1, 1)
+
+
+@pytest.fixture()
+def base_job(db: Session) -> MaintenanceJobModel:
+    """The plain retention job most tests hang runs off."""
+    job = MaintenanceJobModel(
+        key="test_job",
+        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
+        name="Test Job",
+        schedule_cron="0 3 * * *",
+    )
+    db.add(job)
+    db.flush()
+    return job
+
 
 def test_list_jobs_all(db: Session):
     """Test listing all maintenance jobs."""
@@ -69,23 +90,13 @@ def test_list_jobs_filtered_by_visible(db: Session):
     assert hidden_jobs[0].key == "job2"
 
 
-def test_get_job_by_id(db: Session):
+def test_get_job_by_id(db: Session, base_job: MaintenanceJobModel):
     """Test getting a maintenance job by ID."""
     svc = MaintenanceService(db)
     
-    job = MaintenanceJobModel(
-        key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
-        name="Test Job",
-        schedule_cron="0 3 * * *",
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    
-    found = svc.get_job(job.id)
+    found = svc.get_job(base_job.id)
     assert found is not None
-    assert found.id == job.id
+    assert found.id == base_job.id
     assert found.key == "test_job"
     
     not_found = svc.get_job(99999)
@@ -113,27 +124,20 @@ def test_get_job_by_key(db: Session):
     assert not_found is None
 
 
-def test_list_runs(db: Session):
+def test_list_runs(db: Session, base_job: MaintenanceJobModel):
     """Test listing maintenance runs."""
     svc = MaintenanceService(db)
     
-    job = MaintenanceJobModel(
-        key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
-        name="Test Job",
-        schedule_cron="0 3 * * *",
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    
+    # Distinct start times so the ordering assertion cannot pass on a tie
     run1 = MaintenanceRunModel(
-        maintenance_job_id=job.id,
+        maintenance_job_id=base_job.id,
         status=RunStatus.SUCCESS.value,
+        started_at=_T0,
     )
     run2 = MaintenanceRunModel(
-        maintenance_job_id=job.id,
+        maintenance_job_id=base_job.id,
         status=RunStatus.FAILED.value,
+        started_at=_T0 + timedelta(microseconds=1),
     )
     db.add(run1)
     db.add(run2)
@@ -142,57 +146,41 @@ def test_list_runs(db: Session):
     runs = svc.list_runs()
     assert len(runs) == 2
     # Should be sorted by started_at descending (most recent first)
-    assert runs[0].started_at >= runs[1].started_at
+    assert runs[0].started_at > runs[1].started_at
+    assert [r.id for r in runs] == [run2.id, run1.id]
 
 
-def test_list_runs_with_limit(db: Session):
+def test_list_runs_with_limit(db: Session, base_job: MaintenanceJobModel):
     """Test listing maintenance runs with limit."""
     svc = MaintenanceService(db)
     
-    job = MaintenanceJobModel(
-        key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
-        name="Test Job",
-        schedule_cron="0 3 * * *",
+    started = [_T0 + timedelta(minutes=i) for i in range(5)]
+    db.execute(
+        insert(MaintenanceRunModel),
+        [
+            {"maintenance_job_id": base_job.id, "status": RunStatus.SUCCESS.value, "started_at": ts}
+            for ts in started
+        ],
     )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    
-    for i in range(5):
-        run = MaintenanceRunModel(
-            maintenance_job_id=job.id,
-            status=RunStatus.SUCCESS.value,
-        )
-        db.add(run)
     db.commit()
     
     runs = svc.list_runs(limit=3)
     assert len(runs) == 3
+    # The three most recent, newest first
+    assert [r.started_at for r in runs] == started[:1:-1]
 
 
-def test_get_run(db: Session):
+def test_get_run(db: Session, base_job: MaintenanceJobModel):
     """Test getting a maintenance run by ID."""
     svc = MaintenanceService(db)
     
-    job = MaintenanceJobModel(
-        key="test_job",
-        job_type=MaintenanceJobType.RETENTION_CLEANUP.value,
-        name="Test Job",
-        schedule_cron="0 3 * * *",
-    )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-    
     run = MaintenanceRunModel(
-        maintenance_job_id=job.id,
+        maintenance_job_id=base_job.id,
         status=RunStatus.SUCCESS.value,
         message="Test message",
     )
     db.add(run)
     db.commit()
-    db.refresh(run)
     
     found = svc.get_run(run.id)
     assert found is not None
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import json
 import os
-import tempfile
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
 from app.models import Job as JobModel, Run as RunModel, Tag as TagModel, Target as TargetModel, Settings as SettingsModel
@@ -23,13 +24,28 @@ from app.services.retention import (
     SERVER_TZ,
 )
 
+try:
+    from pyfakefs.fake_filesystem import OSType
+except ImportError:  # pragma: no cover - fake_fs skips the filesystem tests too
+    OSType = None
+
+# Shared policies, built once; settings rows take the JSON form, compute_keep_set the dict
+_POLICY_DAILY_1 = {"rules": [{"unit": "day", "window": 1, "keep": 1}]}
+_POLICY_DAILY_1_JSON = json.dumps(_POLICY_DAILY_1)
+_POLICY_TIERED = {
+    "rules": [
+        {"unit": "day", "window": 7, "keep": 1},
+        {"unit": "week", "window": 4, "keep": 1},
+        {"unit": "month", "window": 6, "keep": 1},
+    ]
+}
+
 
 def _create_tag(db: Session, name: str = "test-tag") -> TagModel:
     """Create a tag for testing."""
     tag = TagModel(display_name=name)
     db.add(tag)
-    db.commit()
-    db.refresh(tag)
+    db.flush()
     return tag
 
 
@@ -37,23 +53,20 @@ def _create_target(db: Session, name: str = "test-target") -> TargetModel:
     """Create a target for testing."""
     target = TargetModel(name=name, slug=name.lower().replace(" ", "-"), plugin_name="pihole", plugin_config_json="{}")
     db.add(target)
-    db.commit()
-    db.refresh(target)
+    db.flush()
     return target
 
 
-def _create_job(db: Session, tag: TagModel, retention_json: str | None = None) -> JobModel:
+def _create_job(db: Session, tag: TagModel) -> JobModel:
     """Create a job for testing."""
     job = JobModel(
         tag_id=tag.id,
         name="Test Job",
         schedule_cron="0 2 * * *",
         enabled=True,
-        retention_policy_json=retention_json,
     )
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    db.flush()
     return job
 
 
@@ -65,34 +78,103 @@ def _create_run_with_target_run(
     artifact_path: str | None = None,
 ) -> tuple[RunModel, TargetRunModel]:
     """Create a run and target_run for testing."""
-    run = RunModel(
-        job_id=job.id,
-        started_at=started_at,
-        finished_at=started_at + timedelta(minutes=5),
-        status=RunStatus.SUCCESS.value,
-        operation=RunOperation.BACKUP.value,
-    )
-    db.add(run)
-    db.commit()
-    db.refresh(run)
-    
-    target_run = TargetRunModel(
-        run_id=run.id,
-        target_id=target.id,
-        started_at=started_at,
-        finished_at=started_at + timedelta(minutes=5),
-        status=TargetRunStatus.SUCCESS.value,
-        operation=TargetRunOperation.BACKUP.value,
-        artifact_path=artifact_path,
-        artifact_bytes=1024 if artifact_path else None,
-    )
-    db.add(target_run)
-    db.commit()
-    db.refresh(target_run)
-    
+    [(run, target_run)] = _create_many_runs(db, job, target, [(started_at, artifact_path)])
     return run, target_run
 
 
+def _create_many_runs(
+    db: Session,
+    job: JobModel,
+    target: TargetModel,
+    specs: list[tuple[datetime, str | None]],
+) -> list[tuple[RunModel, TargetRunModel]]:
+    """Insert one successful run + target_run per ``(started_at, artifact_path)``.
+
+    Uses one bulk ``INSERT ... RETURNING`` per table, so rows skip the
+    unit-of-work while callers still get ORM objects back.
+    """
+    runs = list(db.scalars(
+        insert(RunModel).returning(RunModel, sort_by_parameter_order=True),
+        [
+            {
+                "job_id": job.id,
+                "started_at": started_at,
+                "finished_at": started_at + timedelta(minutes=5),
+                "status": RunStatus.SUCCESS.value,
+                "operation": RunOperation.BACKUP.value,
+            }
+            for started_at, _ in specs
+        ],
+    ))
+    target_runs = list(db.scalars(
+        insert(TargetRunModel).returning(TargetRunModel, sort_by_parameter_order=True),
+        [
+            {
+                "run_id": run.id,
+                "target_id": target.id,
+                "started_at": started_at,
+                "finished_at": started_at + timedelta(minutes=5),
+                "status": TargetRunStatus.SUCCESS.value,
+                "operation": TargetRunOperation.BACKUP.value,
+                "artifact_path": artifact_path,
+                "artifact_bytes": 1024 if artifact_path else None,
+            }
+            for run, (started_at, artifact_path) in zip(runs, specs)
+        ],
+    ))
+    return list(zip(runs, target_runs))
+
+
+@pytest.fixture(autouse=True)
+def _clear_policy_cache():
+    """Start every test with an empty parsed-policy cache."""
+    _parse_retention_policy.cache_clear()
+
+
+@pytest.fixture()
+def now() -> datetime:
+    """Fixed wall clock so window arithmetic never straddles midnight mid-test."""
+    return datetime(2025, 1, 15, 12, 0, tzinfo=SERVER_TZ)
+
+
+@pytest.fixture()
+def global_policy(db: Session) -> SettingsModel:
+    """Global one-day retention policy in the settings singleton."""
+    settings = SettingsModel(id=1, global_retention_policy_json=_POLICY_DAILY_1_JSON)
+    db.add(settings)
+    db.commit()
+    return settings
+
+
+@pytest.fixture()
+def tag(db: Session) -> TagModel:
+    return _create_tag(db)
+
+
+@pytest.fixture()
+def target(db: Session) -> TargetModel:
+    return _create_target(db)
+
+
+@pytest.fixture()
+def job(db: Session, tag: TagModel) -> JobModel:
+    """Job on ``tag`` with no retention override (falls back to global settings)."""
+    return _create_job(db, tag)
+
+
+@dataclass(slots=True)
+class _FakeTargetRun:
+    """Stand-in carrying the only TargetRun fields compute_keep_set reads."""
+
+    id: int
+    started_at: datetime
+
+
+def _fake_runs(*starts: datetime) -> list[_FakeTargetRun]:
+    """Build in-memory candidates with ids 1..N in the given order."""
+    return [_FakeTargetRun(i, ts) for i, ts in enumerate(starts, start=1)]
+
+
 class TestParsePolicyJson:
     """Tests for _parse_retention_policy function."""
     
@@ -124,56 +206,45 @@ class TestParsePolicyJson:
 class TestGetEffectivePolicy:
     """Tests for _get_effective_policy function."""
     
-    def test_job_override_takes_precedence(self, db_session: Session):
+    def test_job_override_takes_precedence(self, db: Session, job):
         """Job-level retention policy overrides global."""
         # Create global settings
         settings = SettingsModel(
             id=1,
             global_retention_policy_json='{"rules": [{"unit": "day", "window": 30, "keep": 1}]}',
         )
-        db_session.add(settings)
-        db_session.commit()
-        
-        # Create job with override
-        tag = _create_tag(db_session)
-        job = _create_job(
-            db_session,
-            tag,
-            retention_json='{"rules": [{"unit": "day", "window": 7, "keep": 1}]}',
-        )
+        db.add(settings)
         
-        policy = _get_effective_policy(db_session, job.id)
+        # Give the shared job an override instead of creating another one
+        job.retention_policy_json = '{"rules": [{"unit": "day", "window": 7, "keep": 1}]}'
+        db.commit()
+        
+        policy = _get_effective_policy(db, job.id)
         assert policy is not None
         assert policy["rules"][0]["window"] == 7  # Job override, not global 30
     
-    def test_falls_back_to_global_when_no_job_override(self, db_session: Session):
+    def test_falls_back_to_global_when_no_job_override(self, db: Session, job):
         """Falls back to global settings when job has no override."""
         settings = SettingsModel(
             id=1,
             global_retention_policy_json='{"rules": [{"unit": "month", "window": 6, "keep": 1}]}',
         )
-        db_session.add(settings)
-        db_session.commit()
-        
-        tag = _create_tag(db_session)
-        job = _create_job(db_session, tag, retention_json=None)
+        db.add(settings)
+        db.commit()
         
-        policy = _get_effective_policy(db_session, job.id)
+        policy = _get_effective_policy(db, job.id)
         assert policy is not None
         assert policy["rules"][0]["unit"] == "month"
         assert policy["rules"][0]["window"] == 6
     
-    def test_returns_none_when_no_policy_configured(self, db_session: Session):
+    def test_returns_none_when_no_policy_configured(self, db: Session, job):
         """Returns None when neither job nor global policy exists."""
-        tag = _create_tag(db_session)
-        job = _create_job(db_session, tag, retention_json=None)
-        
-        policy = _get_effective_policy(db_session, job.id)
+        policy = _get_effective_policy(db, job.id)
         assert policy is None
 
 
 class TestComputeKeepSet:
-    """Tests for compute_keep_set function."""
+    """Tests for compute_keep_set function (pure logic, no database)."""
     
     def test_empty_candidates_returns_empty_set(self):
         """Empty candidate list returns empty keep set."""
@@ -181,93 +252,71 @@ class TestComputeKeepSet:
         result = compute_keep_set([], policy)
         assert result == set()
     
-    def test_no_rules_keeps_everything(self, db_session: Session):
+    def test_no_rules_keeps_everything(self, now):
         """Policy with no rules keeps all backups."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(timezone.utc)
-        _, tr1 = _create_run_with_target_run(db_session, job, target, now - timedelta(days=1), "/backup1")
-        _, tr2 = _create_run_with_target_run(db_session, job, target, now - timedelta(days=2), "/backup2")
+        tr1, tr2 = _fake_runs(now - timedelta(days=1), now - timedelta(days=2))
         
         policy = {"rules": []}
-        result = compute_keep_set([tr1, tr2], policy)
-        assert tr1.id in result
-        assert tr2.id in result
-    
-    def test_daily_rule_keeps_latest_per_day(self, db_session: Session):
-        """Daily rule keeps only the latest backup per day."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Two backups on same day - should keep only the later one
-        _, tr1 = _create_run_with_target_run(db_session, job, target, today_start + timedelta(hours=2), "/backup1")
-        _, tr2 = _create_run_with_target_run(db_session, job, target, today_start + timedelta(hours=8), "/backup2")
-        
-        policy = {"rules": [{"unit": "day", "window": 1, "keep": 1}]}
         result = compute_keep_set([tr1, tr2], policy, now=now)
-        
-        # Only the later backup (tr2) should be kept
+        assert tr1.id in result
         assert tr2.id in result
-        assert tr1.id not in result
     
-    def test_backups_outside_window_not_kept(self, db_session: Session):
-        """Backups outside the retention window are not kept."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Backup from 10 days ago
-        _, tr_old = _create_run_with_target_run(
-            db_session, job, target,
-            now - timedelta(days=10),
-            "/backup_old",
-        )
-        # Backup from 2 days ago
-        _, tr_recent = _create_run_with_target_run(
-            db_session, job, target,
-            now - timedelta(days=2),
-            "/backup_recent",
-        )
+    @pytest.mark.parametrize(
+        "unit, window, starts, expected_kept",
+        [
+            # Two backups on the same day - only the later one is kept
+            pytest.param(
+                "day", 1,
+                lambda now: [now.replace(hour=h, minute=0, second=0, microsecond=0) for h in (2, 8)],
+                {1},
+                id="daily-latest-per-day",
+            ),
+            # Backup from 10 days ago falls outside a 5-day window
+            pytest.param(
+                "day", 5,
+                lambda now: [now - timedelta(days=10), now - timedelta(days=2)],
+                {1},
+                id="outside-window",
+            ),
+            # Monday and Wednesday of the current ISO week - only Wednesday is kept
+            pytest.param(
+                "week", 1,
+                lambda now: [
+                    now - timedelta(days=now.weekday()) + timedelta(hours=2),
+                    now - timedelta(days=now.weekday()) + timedelta(days=2, hours=2),
+                ],
+                {1},
+                id="weekly-latest-per-week",
+            ),
+            # Two backups in the same month - only the later one is kept
+            pytest.param(
+                "month", 1,
+                lambda now: [
+                    now.replace(day=d, hour=0, minute=0, second=0, microsecond=0) for d in (2, 11)
+                ],
+                {1},
+                id="monthly-latest-per-month",
+            ),
+        ],
+    )
+    def test_rule_keeps_latest_in_window(self, unit, window, starts, expected_kept, now):
+        """A single keep=1 rule keeps only the latest backup per period inside its window."""
+        candidates = _fake_runs(*starts(now))
         
-        policy = {"rules": [{"unit": "day", "window": 5, "keep": 1}]}
-        result = compute_keep_set([tr_old, tr_recent], policy, now=now)
+        policy = {"rules": [{"unit": unit, "window": window, "keep": 1}]}
+        result = compute_keep_set(candidates, policy, now=now)
         
-        assert tr_recent.id in result
-        assert tr_old.id not in result
+        assert {i for i, tr in enumerate(candidates) if tr.id in result} == expected_kept
     
-    def test_window_start_normalizes_to_midnight(self, db_session: Session):
+    def test_window_start_normalizes_to_midnight(self, now):
         """Window start is normalized to midnight, so backups from early in the day are included."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
         # Set now to afternoon (e.g., 3 PM) to test normalization
-        now = datetime.now(SERVER_TZ).replace(hour=15, minute=0, second=0, microsecond=0)
-        
-        # Backup from 5 days ago at 2 AM (should be included if window_start is normalized to midnight)
-        five_days_ago = now - timedelta(days=5)
-        backup_early = five_days_ago.replace(hour=2, minute=0, second=0, microsecond=0)
-        _, tr_early = _create_run_with_target_run(
-            db_session, job, target,
-            backup_early,
-            "/backup_early",
-        )
+        now = now.replace(hour=15, minute=0, second=0, microsecond=0)
         
-        # Backup from 6 days ago (should be excluded)
-        six_days_ago = now - timedelta(days=6)
-        _, tr_old = _create_run_with_target_run(
-            db_session, job, target,
-            six_days_ago,
-            "/backup_old",
-        )
+        # Backup from 5 days ago at 2 AM (should be included if window_start is normalized
+        # to midnight), and one from 6 days ago (should be excluded)
+        backup_early = (now - timedelta(days=5)).replace(hour=2, minute=0, second=0, microsecond=0)
+        tr_early, tr_old = _fake_runs(backup_early, now - timedelta(days=6))
         
         policy = {"rules": [{"unit": "day", "window": 5, "keep": 1}]}
         result = compute_keep_set([tr_early, tr_old], policy, now=now)
@@ -277,31 +326,14 @@ class TestComputeKeepSet:
         # The backup from 6 days ago should not be kept
         assert tr_old.id not in result
     
-    def test_hierarchical_retention_excludes_overlapping_windows(self, db_session: Session):
+    def test_hierarchical_retention_excludes_overlapping_windows(self, now):
         """Hierarchical retention: less granular rules exclude backups in more granular windows."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Backup within daily window (should be kept by daily rule)
-        _, tr_daily = _create_run_with_target_run(
-            db_session, job, target,
+        # Within the daily window, older than daily but within monthly, and older
+        # than monthly but within yearly
+        tr_daily, tr_monthly, tr_yearly = _fake_runs(
             now - timedelta(days=1),
-            "/backup_daily",
-        )
-        # Backup older than daily window but within monthly window (should be kept by monthly rule)
-        _, tr_monthly = _create_run_with_target_run(
-            db_session, job, target,
             now - timedelta(days=20),
-            "/backup_monthly",
-        )
-        # Backup older than monthly window but within yearly window (should be kept by yearly rule)
-        _, tr_yearly = _create_run_with_target_run(
-            db_session, job, target,
             now - timedelta(days=400),
-            "/backup_yearly",
         )
         
         policy = {
@@ -318,26 +350,10 @@ class TestComputeKeepSet:
         assert tr_monthly.id in result, "Monthly backup should be kept by monthly rule (outside daily window)"
         assert tr_yearly.id in result, "Yearly backup should be kept by yearly rule (outside monthly window)"
     
-    def test_hierarchical_retention_daily_excludes_from_monthly(self, db_session: Session):
+    def test_hierarchical_retention_daily_excludes_from_monthly(self, now):
         """Daily backups are not also kept by monthly rule (hierarchical exclusion)."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Backup within daily window
-        _, tr_recent = _create_run_with_target_run(
-            db_session, job, target,
-            now - timedelta(days=2),
-            "/backup_recent",
-        )
-        # Backup just outside daily window but in same month
-        _, tr_older = _create_run_with_target_run(
-            db_session, job, target,
-            now - timedelta(days=8),
-            "/backup_older",
-        )
+        # Within the daily window, and just outside it but in the same month
+        tr_recent, tr_older = _fake_runs(now - timedelta(days=2), now - timedelta(days=8))
         
         policy = {
             "rules": [
@@ -351,114 +367,20 @@ class TestComputeKeepSet:
         assert tr_recent.id in result
         assert tr_older.id in result
 
-    def test_weekly_rule_keeps_one_per_week(self, db_session: Session):
-        """Weekly rule keeps only the latest backup per ISO week."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Create two backups in the same week (should keep only latest)
-        week_start = now - timedelta(days=now.weekday())  # Monday of current week
-        _, tr_mon = _create_run_with_target_run(
-            db_session, job, target,
-            week_start + timedelta(hours=2),
-            "/backup_monday",
-        )
-        _, tr_wed = _create_run_with_target_run(
-            db_session, job, target,
-            week_start + timedelta(days=2, hours=2),
-            "/backup_wednesday",
-        )
-        
-        policy = {"rules": [{"unit": "week", "window": 1, "keep": 1}]}
-        result = compute_keep_set([tr_mon, tr_wed], policy, now=now)
-        
-        # Only the later backup (Wednesday) should be kept
-        assert tr_wed.id in result
-        assert tr_mon.id not in result
-
-    def test_monthly_rule_keeps_one_per_month(self, db_session: Session):
-        """Monthly rule keeps only the latest backup per month."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Create two backups in the same month (should keep only latest)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        _, tr_early = _create_run_with_target_run(
-            db_session, job, target,
-            month_start + timedelta(days=1),
-            "/backup_early_month",
-        )
-        _, tr_late = _create_run_with_target_run(
-            db_session, job, target,
-            month_start + timedelta(days=10),
-            "/backup_late_month",
-        )
-        
-        policy = {"rules": [{"unit": "month", "window": 1, "keep": 1}]}
-        result = compute_keep_set([tr_early, tr_late], policy, now=now)
-        
-        # Only the later backup should be kept
-        assert tr_late.id in result
-        assert tr_early.id not in result
-
-    def test_full_tiered_retention(self, db_session: Session):
+    def test_full_tiered_retention(self, now):
         """Full tiered retention: 7 daily, 4 weekly, 6 monthly."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        now = datetime.now(SERVER_TZ)
-        
-        # Create backups spanning multiple tiers
-        backups = []
-        
-        # Recent daily backups (last 7 days)
-        for i in range(7):
-            _, tr = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(days=i),
-                f"/backup_day_{i}",
-            )
-            backups.append(tr)
-        
-        # Weekly backup (2 weeks ago - outside daily, inside weekly)
-        _, tr_week2 = _create_run_with_target_run(
-            db_session, job, target,
+        # Recent daily backups (last 7 days), then one each outside the daily,
+        # weekly and monthly windows in turn
+        backups = _fake_runs(
+            *(now - timedelta(days=i) for i in range(7)),
             now - timedelta(weeks=2),
-            "/backup_week_2",
-        )
-        backups.append(tr_week2)
-        
-        # Monthly backup (2 months ago - outside weekly, inside monthly)
-        _, tr_month2 = _create_run_with_target_run(
-            db_session, job, target,
             now - timedelta(days=60),
-            "/backup_month_2",
-        )
-        backups.append(tr_month2)
-        
-        # Very old backup (8 months ago - outside all windows)
-        _, tr_old = _create_run_with_target_run(
-            db_session, job, target,
             now - timedelta(days=240),
-            "/backup_too_old",
         )
-        backups.append(tr_old)
+        tr_week2, tr_month2, tr_old = backups[7:]
         
-        policy = {
-            "rules": [
-                {"unit": "day", "window": 7, "keep": 1},
-                {"unit": "week", "window": 4, "keep": 1},
-                {"unit": "month", "window": 6, "keep": 1},
-            ]
-        }
-        result = compute_keep_set(backups, policy, now=now)
+        latest_first = sorted(backups, key=lambda b: b.started_at, reverse=True)
+        result = compute_keep_set(latest_first, _POLICY_TIERED, now=now, presorted=True)
         
         # All 7 daily backups should be kept
         for i in range(7):
@@ -475,185 +397,192 @@ class TestComputeKeepSet:
 
 
 class TestApplyRetention:
-    """Tests for apply_retention function with actual file deletion."""
+    """Tests for apply_retention function with file deletion on an in-memory filesystem."""
     
-    def test_no_policy_keeps_everything(self, db_session: Session):
+    def test_no_policy_keeps_everything(self, db: Session, target, job, now, fake_fs):
         """When no policy is configured, nothing is deleted."""
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag, retention_json=None)
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            artifact = os.path.join(tmpdir, "backup.tar.gz")
-            with open(artifact, "w") as f:
-                f.write("test")
-            
-            _, tr = _create_run_with_target_run(
-                db_session, job, target,
-                datetime.now(timezone.utc) - timedelta(days=100),
-                artifact,
-            )
-            
-            result = apply_retention(db_session, job.id, target.id)
-            
-            # No policy = keep everything
-            assert result["delete_count"] == 0
-            assert os.path.exists(artifact)
+        backup_dir = "/backups"
+        fake_fs.create_dir(backup_dir)
+
+        artifact = os.path.join(backup_dir, "backup.tar.gz")
+        with open(artifact, "w") as f:
+            f.write("test")
+        
+        _, tr = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(days=100),
+            artifact,
+        )
+        
+        statements: list[str] = []
+        
+        def _record(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+            statements.append(statement)
+        
+        conn = db.connection()
+        event.listen(conn, "before_cursor_execute", _record)
+        try:
+            result = apply_retention(db, job.id, target.id, now=now)
+        finally:
+            event.remove(conn, "before_cursor_execute", _record)
+        
+        # No policy = keep everything, without looking at candidate rows
+        assert result["delete_count"] == 0
+        assert os.path.exists(artifact)
+        assert statements and not [s for s in statements if "target_runs" in s]
     
-    def test_deletes_artifact_and_sidecar(self, db_session: Session):
+    def test_deletes_artifact_and_sidecar(self, db: Session, target, job, now, global_policy, fake_fs):
         """Retention deletes artifact file and sidecar metadata."""
-        # Create settings with aggressive retention
-        settings = SettingsModel(
-            id=1,
-            global_retention_policy_json='{"rules": [{"unit": "day", "window": 1, "keep": 1}]}',
+        backup_dir = "/backups"
+        fake_fs.create_dir(backup_dir)
+
+        # Create old artifact (outside retention window)
+        old_artifact = os.path.join(backup_dir, "old_backup.tar.gz")
+        old_sidecar = f"{old_artifact}.meta.json"
+        with open(old_artifact, "w") as f:
+            f.write("old backup data")
+        with open(old_sidecar, "w") as f:
+            f.write('{"plugin": "test"}')
+        
+        # Create recent artifact (within retention window)
+        recent_artifact = os.path.join(backup_dir, "recent_backup.tar.gz")
+        with open(recent_artifact, "w") as f:
+            f.write("recent backup data")
+        
+        _, tr_old = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(days=5),
+            old_artifact,
+        )
+        _, tr_recent = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(hours=1),
+            recent_artifact,
         )
-        db_session.add(settings)
-        db_session.commit()
-        
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create old artifact (outside retention window)
-            old_artifact = os.path.join(tmpdir, "old_backup.tar.gz")
-            old_sidecar = f"{old_artifact}.meta.json"
-            with open(old_artifact, "w") as f:
-                f.write("old backup data")
-            with open(old_sidecar, "w") as f:
-                f.write('{"plugin": "test"}')
-            
-            # Create recent artifact (within retention window)
-            recent_artifact = os.path.join(tmpdir, "recent_backup.tar.gz")
-            with open(recent_artifact, "w") as f:
-                f.write("recent backup data")
-            
-            now = datetime.now(SERVER_TZ)
-            _, tr_old = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(days=5),
-                old_artifact,
-            )
-            _, tr_recent = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(hours=1),
-                recent_artifact,
-            )
-            
-            result = apply_retention(db_session, job.id, target.id)
-            
-            # Old artifact should be deleted
-            assert result["delete_count"] == 1
-            assert not os.path.exists(old_artifact)
-            assert not os.path.exists(old_sidecar)
-            
-            # Recent artifact should remain
-            assert result["keep_count"] == 1
-            assert os.path.exists(recent_artifact)
+        
+        result = apply_retention(db, job.id, target.id, now=now)
+        
+        # Old artifact should be deleted
+        assert result["delete_count"] == 1
+        assert not os.path.exists(old_artifact)
+        assert not os.path.exists(old_sidecar)
+        
+        # Recent artifact should remain
+        assert result["keep_count"] == 1
+        assert os.path.exists(recent_artifact)
+    
+    # unlink() on a directory raises IsADirectoryError on Linux but PermissionError on macOS
+    @pytest.mark.parametrize(
+        "os_type",
+        [OSType.LINUX, OSType.MACOS] if OSType else [],
+        ids=["linux", "macos"] if OSType else [],
+    )
+    def test_deletes_directory_artifact(
+        self, db: Session, target, job, now, global_policy, fake_fs, os_type
+    ):
+        """Directory artifacts are removed recursively along with their sidecar."""
+        fake_fs.os = os_type
+        old_artifact = "/backups/old_backup"
+        old_sidecar = f"{old_artifact}.meta.json"
+        fake_fs.create_file(f"{old_artifact}/dump.sql", contents="old")
+        fake_fs.create_file(old_sidecar, contents='{"plugin": "test"}')
+        recent_artifact = "/backups/recent_backup"
+        fake_fs.create_file(f"{recent_artifact}/dump.sql", contents="recent")
+        
+        _create_many_runs(db, job, target, [
+            (now - timedelta(days=5), old_artifact),
+            (now - timedelta(hours=1), recent_artifact),
+        ])
+        
+        result = apply_retention(db, job.id, target.id, now=now)
+        
+        assert result["delete_count"] == 1
+        assert not os.path.exists(old_artifact)
+        assert not os.path.exists(old_sidecar)
+        assert os.path.isdir(recent_artifact)
     
-    def test_deletes_db_rows(self, db_session: Session):
+    def test_deletes_db_rows(self, db: Session, target, job, now, global_policy, fake_fs):
         """Retention deletes TargetRun and orphaned Run from DB."""
-        settings = SettingsModel(
-            id=1,
-            global_retention_policy_json='{"rules": [{"unit": "day", "window": 1, "keep": 1}]}',
+        backup_dir = "/backups"
+        fake_fs.create_dir(backup_dir)
+
+        old_artifact = os.path.join(backup_dir, "old.tar.gz")
+        with open(old_artifact, "w") as f:
+            f.write("data")
+        
+        run_old, tr_old = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(days=10),
+            old_artifact,
+        )
+        run_old_id = run_old.id
+        tr_old_id = tr_old.id
+        
+        _, tr_recent = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(hours=1),
+            os.path.join(backup_dir, "recent.tar.gz"),
         )
-        db_session.add(settings)
-        db_session.commit()
-        
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            old_artifact = os.path.join(tmpdir, "old.tar.gz")
-            with open(old_artifact, "w") as f:
-                f.write("data")
-            
-            now = datetime.now(SERVER_TZ)
-            run_old, tr_old = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(days=10),
-                old_artifact,
-            )
-            run_old_id = run_old.id
-            tr_old_id = tr_old.id
-            
-            _, tr_recent = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(hours=1),
-                os.path.join(tmpdir, "recent.tar.gz"),
-            )
-            with open(tr_recent.artifact_path, "w") as f:
-                f.write("recent")
-            
-            apply_retention(db_session, job.id, target.id)
-            
-            # Old TargetRun should be deleted
-            assert db_session.get(TargetRunModel, tr_old_id) is None
-            # Old Run should be deleted (no remaining TargetRuns)
-            assert db_session.get(RunModel, run_old_id) is None
-            # Recent should remain
-            assert db_session.get(TargetRunModel, tr_recent.id) is not None
+        with open(tr_recent.artifact_path, "w") as f:
+            f.write("recent")
+        
+        apply_retention(db, job.id, target.id, now=now)
+        
+        # Old TargetRun should be deleted
+        assert db.get(TargetRunModel, tr_old_id) is None
+        # Old Run should be deleted (no remaining TargetRuns)
+        assert db.get(RunModel, run_old_id) is None
+        # Recent should remain
+        assert db.get(TargetRunModel, tr_recent.id) is not None
     
-    def test_dry_run_does_not_delete(self, db_session: Session):
+    def test_dry_run_does_not_delete(self, db: Session, target, job, now, global_policy, fake_fs):
         """Dry run computes but does not delete."""
-        settings = SettingsModel(
-            id=1,
-            global_retention_policy_json='{"rules": [{"unit": "day", "window": 1, "keep": 1}]}',
+        backup_dir = "/backups"
+        fake_fs.create_dir(backup_dir)
+
+        old_artifact = os.path.join(backup_dir, "old.tar.gz")
+        with open(old_artifact, "w") as f:
+            f.write("data")
+        
+        _, tr_old = _create_run_with_target_run(
+            db, job, target,
+            now - timedelta(days=10),
+            old_artifact,
         )
-        db_session.add(settings)
-        db_session.commit()
-        
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            old_artifact = os.path.join(tmpdir, "old.tar.gz")
-            with open(old_artifact, "w") as f:
-                f.write("data")
-            
-            now = datetime.now(SERVER_TZ)
-            _, tr_old = _create_run_with_target_run(
-                db_session, job, target,
-                now - timedelta(days=10),
-                old_artifact,
-            )
-            
-            result = apply_retention(db_session, job.id, target.id, dry_run=True)
-            
-            # Should report deletion but not actually delete
-            assert result["delete_count"] == 1
-            assert os.path.exists(old_artifact)  # File still exists
-            assert db_session.get(TargetRunModel, tr_old.id) is not None  # DB row still exists
+        
+        result = apply_retention(db, job.id, target.id, dry_run=True, now=now)
+        
+        # Should report deletion but not actually delete
+        assert result["delete_count"] == 1
+        assert os.path.exists(old_artifact)  # File still exists
+        assert db.get(TargetRunModel, tr_old.id) is not None  # DB row still exists
 
 
 class TestRetentionService:
     """Tests for RetentionService class."""
     
-    def test_preview_returns_dry_run_result(self, db_session: Session):
+    def test_get_effective_policy_returns_independent_copy(self, db: Session, job, global_policy):
+        """Mutating a returned policy does not leak into the parsed-policy cache."""
+        svc = RetentionService(db)
+        policy = svc.get_effective_policy(job.id)
+        policy["rules"][0]["window"] = 99
+        policy["rules"].append({"unit": "year", "window": 1, "keep": 1})
+        
+        assert svc.get_effective_policy(job.id) == _POLICY_DAILY_1
+    
+    def test_preview_returns_dry_run_result(self, db: Session, target, job, now, global_policy, fake_fs):
         """preview() returns dry-run result without deleting."""
-        settings = SettingsModel(
-            id=1,
-            global_retention_policy_json='{"rules": [{"unit": "day", "window": 1, "keep": 1}]}',
-        )
-        db_session.add(settings)
-        db_session.commit()
-        
-        tag = _create_tag(db_session)
-        target = _create_target(db_session)
-        job = _create_job(db_session, tag)
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            artifact = os.path.join(tmpdir, "backup.tar.gz")
-            with open(artifact, "w") as f:
-                f.write("data")
-            
-            now = datetime.now(SERVER_TZ)
-            _create_run_with_target_run(db_session, job, target, now - timedelta(days=10), artifact)
-            
-            svc = RetentionService(db_session)
-            result = svc.preview(job.id, target.id)
-            
-            assert result["delete_count"] == 1
-            assert os.path.exists(artifact)  # Not actually deleted
+        backup_dir = "/backups"
+        fake_fs.create_dir(backup_dir)
+
+        artifact = os.path.join(backup_dir, "backup.tar.gz")
+        with open(artifact, "w") as f:
+            f.write("data")
+        
+        _create_run_with_target_run(db, job, target, now - timedelta(days=10), artifact)
+        
+        svc = RetentionService(db)
+        result = svc.preview(job.id, target.id)
+        
+        assert result["delete_count"] == 1
+        assert os.path.exists(artifact)  # Not actually deleted
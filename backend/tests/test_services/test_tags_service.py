@@ -3,9 +3,10 @@ from __future__ import annotations
 import pytest
 from sqlalchemy.exc import IntegrityError
 
-from app.models import TargetTag, Job
-from app.services import TagService, TargetService, GroupService
+from app.models import Job
+from app.services import TagService
 from app.models import Tag as TagModel, slugify
+from tests.factories import auto_tag_of
 
 
 def test_tag_service_create_normalizes_and_idempotent(db):
@@ -16,18 +17,12 @@ def test_tag_service_create_normalizes_and_idempotent(db):
     assert t1.id == t2.id
 
 
-def test_tag_service_delete_blocks_jobs_allows_auto(db):
+def test_tag_service_delete_blocks_jobs_allows_auto(db, tsvc):
     svc = TagService(db)
     # Create target and auto-tag via TargetService
-    tsvc = TargetService(db)
     target = tsvc.create(name="alpha", plugin_name="p", plugin_config_json="{}")
     # Find the auto-tag
-    auto_tt = (
-        db.query(TargetTag)
-        .filter(TargetTag.target_id == target.id, TargetTag.origin == "AUTO")
-        .one()
-    )
-    auto_tag_id = auto_tt.tag_id
+    auto_tag_id = auto_tag_of(db, target.id).tag_id
     # Deleting auto-tag should be allowed now
     assert svc.delete(auto_tag_id) is True
 
@@ -39,9 +34,8 @@ def test_tag_service_delete_blocks_jobs_allows_auto(db):
         svc.delete(manual.id)
 
 
-def test_tag_service_can_delete_group_auto_tag(db):
+def test_tag_service_can_delete_group_auto_tag(db, gsvc):
     svc = TagService(db)
-    gsvc = GroupService(db)
     # Create a group which auto-creates a tag and links it
     g = gsvc.create("Ops")
     # Resolve the group's auto-tag by slug
@@ -4,18 +4,15 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 from app.models import Tag, TargetTag
-from app.services import GroupService, TargetService
+from tests.factories import auto_tag_of, make_target_with_groups
 
 
-def test_target_create_creates_auto_tag_and_optional_group_propagation(db):
-    gsvc = GroupService(db)
-    tsvc = TargetService(db)
+def test_target_create_creates_auto_tag_and_optional_group_propagation(db, gsvc, tsvc):
     g = gsvc.create("G")
     gsvc.add_tags(g.id, ["A", "B"])  # create tags and link group
     tgt = tsvc.create(name="svc", plugin_name="p", plugin_config_json="{}", group_id=g.id)
-    # Has AUTO
-    auto = db.query(TargetTag).filter(TargetTag.target_id == tgt.id, TargetTag.origin == "AUTO").one_or_none()
-    assert auto is not None
+    # Has AUTO (raises unless exactly one row)
+    auto_tag_of(db, tgt.id)
     # Has GROUP for group's auto-tag plus A and B
     group_rows = (
         db.query(TargetTag)
@@ -29,8 +26,7 @@ def test_target_create_creates_auto_tag_and_optional_group_propagation(db):
     assert len(group_rows) == 3
 
 
-def test_target_rename_updates_auto_tag_and_detects_collision(db):
-    tsvc = TargetService(db)
+def test_target_rename_updates_auto_tag_and_detects_collision(db, tsvc):
     # Create two targets (auto-tags: x, y)
     t1 = tsvc.create(name="x", plugin_name="p", plugin_config_json="{}")
     t2 = tsvc.create(name="y", plugin_name="p", plugin_config_json="{}")
@@ -43,29 +39,16 @@ def test_target_rename_updates_auto_tag_and_detects_collision(db):
     updated = tsvc.rename(t1.id, "x-new")
     assert updated.name == "x-new"
     # Auto-tag should be normalized to x-new
-    auto_tt = db.query(TargetTag).filter(TargetTag.target_id == t1.id, TargetTag.origin == "AUTO").one()
+    auto_tt = auto_tag_of(db, t1.id)
     auto_tag = db.get(Tag, auto_tt.tag_id)
     assert auto_tag is not None and auto_tag.slug == "x-new"
 
 
-def test_target_move_and_remove_group_adjusts_only_group_origin(db):
-    gsvc = GroupService(db)
-    tsvc = TargetService(db)
-    g1 = gsvc.create("G1")
-    g2 = gsvc.create("G2")
-    gsvc.add_tags(g1.id, ["A"])  # tag A
-    gsvc.add_tags(g2.id, ["B"])  # tag B
-
-    tgt = tsvc.create(name="svc", plugin_name="p", plugin_config_json="{}")
-    # Attach a DIRECT tag
-    direct_tag = db.query(Tag).filter(Tag.slug == "manual").one_or_none()
-    if direct_tag is None:
-        direct_tag = Tag(display_name="manual")
-        db.add(direct_tag)
-        db.commit()
-        db.refresh(direct_tag)
-    db.add(TargetTag(target_id=tgt.id, tag_id=direct_tag.id, origin="DIRECT"))
-    db.commit()
+def test_target_move_and_remove_group_adjusts_only_group_origin(db, tsvc):
+    tgt, groups = make_target_with_groups(
+        db, "svc", {"G1": ["A"], "G2": ["B"]}, direct_tags=["manual"]
+    )
+    g1, g2 = groups["G1"], groups["G2"]
 
     tsvc.move_to_group(tgt.id, g1.id)
     # Now move to g2
@@ -4,7 +4,6 @@ import json
 import os
 import tempfile
 from pathlib import Path
-from datetime import datetime, timezone
 
 import pytest
 
@@ -34,28 +33,62 @@ class MockBackupPlugin(BackupPlugin):
         return {"status": "ok"}
 
 
+# The writer only reads these, so one instance of each serves every test
+_PLUGIN = MockBackupPlugin()
+_CONTEXT = BackupContext(
+    job_id="1",
+    target_id="1",
+    config={},
+    metadata={"target_slug": "test-target"},
+)
+
+# Hand-written sidecar for read tests; a fixed timestamp keeps the clock out of it
+_FIXED_ISO_TS = "2025-01-01T00:00:00+00:00"
+_SIDECAR_TEMPLATE = {
+    "plugin_name": "test_plugin",
+    "plugin_version": "1.0.0",
+    "target_slug": "test-target",
+    "created_at": _FIXED_ISO_TS,
+}
+
+
+def _touch(path: str) -> None:
+    """Create an empty artifact file with raw ``os`` calls (no pathlib layer)."""
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644))
+
+
+def _write(path: str, payload: bytes) -> None:
+    """Replace ``path`` with ``payload`` in a single ``write`` call."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture(scope="module")
+def _sidecar_dir(tmp_path_factory):
+    """One directory for the read tests; each test names its artifact after itself."""
+    return tmp_path_factory.mktemp("sidecars")
+
+
+@pytest.fixture()
+def artifact_path(_sidecar_dir, request) -> str:
+    """Unique artifact path for a read test inside the shared directory."""
+    return str(_sidecar_dir / f"{request.node.name}.tar.gz")
+
+
 def test_write_backup_sidecar(tmp_path):
     """Test writing sidecar metadata file."""
     artifact_path = str(tmp_path / "backup.tar.gz")
+    _touch(artifact_path)
     
-    # Create a dummy artifact file
-    Path(artifact_path).touch()
-    
-    plugin = MockBackupPlugin()
-    context = BackupContext(
-        job_id="1",
-        target_id="1",
-        config={},
-        metadata={"target_slug": "test-target"},
-    )
-    
-    write_backup_sidecar(artifact_path, plugin, context)
+    write_backup_sidecar(artifact_path, _PLUGIN, _CONTEXT)
     
     sidecar_path = f"{artifact_path}.meta.json"
-    assert os.path.exists(sidecar_path)
+    assert os.access(sidecar_path, os.F_OK)
     
-    with open(sidecar_path, "r") as f:
-        data = json.load(f)
+    data = json.loads(Path(sidecar_path).read_bytes())
     
     assert data["plugin_name"] == "test_plugin"
     assert data["plugin_version"] == "1.0.0"
@@ -67,9 +100,8 @@ def test_write_backup_sidecar(tmp_path):
 def test_write_backup_sidecar_fallback_target_id(tmp_path):
     """Test sidecar uses target_id when target_slug not in metadata."""
     artifact_path = str(tmp_path / "backup.tar.gz")
-    Path(artifact_path).touch()
+    _touch(artifact_path)
     
-    plugin = MockBackupPlugin()
     context = BackupContext(
         job_id="1",
         target_id="42",
@@ -77,31 +109,19 @@ def test_write_backup_sidecar_fallback_target_id(tmp_path):
         metadata={},
     )
     
-    write_backup_sidecar(artifact_path, plugin, context)
+    write_backup_sidecar(artifact_path, _PLUGIN, context)
     
     sidecar_path = f"{artifact_path}.meta.json"
-    with open(sidecar_path, "r") as f:
-        data = json.load(f)
+    data = json.loads(Path(sidecar_path).read_bytes())
     
     assert data["target_slug"] == "42"
 
 
-def test_read_backup_sidecar(tmp_path):
+def test_read_backup_sidecar(artifact_path):
     """Test reading sidecar metadata."""
-    artifact_path = str(tmp_path / "backup.tar.gz")
-    Path(artifact_path).touch()
-    
-    sidecar_path = f"{artifact_path}.meta.json"
-    sidecar_data = {
-        "plugin_name": "test_plugin",
-        "plugin_version": "1.0.0",
-        "target_slug": "test-target",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "artifact_path": artifact_path,
-    }
-    
-    with open(sidecar_path, "w") as f:
-        json.dump(sidecar_data, f)
+    _touch(artifact_path)
+    sidecar_data = {**_SIDECAR_TEMPLATE, "artifact_path": artifact_path}
+    _write(f"{artifact_path}.meta.json", json.dumps(sidecar_data).encode())
     
     result = read_backup_sidecar(artifact_path)
     assert result is not None
@@ -109,35 +129,18 @@ def test_read_backup_sidecar(tmp_path):
     assert result["target_slug"] == "test-target"
 
 
-def test_read_backup_sidecar_missing():
-    """Test reading sidecar when file doesn't exist."""
-    result = read_backup_sidecar("/nonexistent/path/backup.tar.gz")
-    assert result is None
-
-
-def test_read_backup_sidecar_invalid_json(tmp_path):
-    """Test reading sidecar with invalid JSON."""
-    artifact_path = str(tmp_path / "backup.tar.gz")
-    Path(artifact_path).touch()
-    
-    sidecar_path = f"{artifact_path}.meta.json"
-    with open(sidecar_path, "w") as f:
-        f.write("invalid json")
-    
-    result = read_backup_sidecar(artifact_path)
-    assert result is None
-
-
-def test_read_backup_sidecar_missing_required_fields(tmp_path):
-    """Test reading sidecar with missing required fields."""
-    artifact_path = str(tmp_path / "backup.tar.gz")
-    Path(artifact_path).touch()
-    
-    sidecar_path = f"{artifact_path}.meta.json"
-    with open(sidecar_path, "w") as f:
-        json.dump({"some_field": "value"}, f)
-    
-    result = read_backup_sidecar(artifact_path)
-    assert result is None
-
-
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param(None, id="missing"),
+        pytest.param(b"invalid json", id="invalid-json"),
+        pytest.param(json.dumps({"some_field": "value"}).encode(), id="missing-required-fields"),
+    ],
+)
+def test_read_backup_sidecar_failure_modes(artifact_path, payload):
+    """Missing, unparsable and incomplete sidecars all read as None."""
+    if payload is not None:
+        _touch(artifact_path)
+        _write(f"{artifact_path}.meta.json", payload)
+    
+    assert read_backup_sidecar(artifact_path) is None